@@ -0,0 +1,14 @@
+# Google Maps scraper package. Importing it is cheap: Selenium, bs4 and requests
+# are only imported by the functions that need them, and no browser is started.
+
+__version__ = "0.2.0"
+
+from .cli import main
+from .session import Scraper
+from .pages import SearchOutcome
+from .geocode import get_location_coordinates
+from .scraper import scrape_google_maps_urls, scrape_google_maps_http, harvest_search, scrape_place, scrape_places, scrape_places_multitab
+from .browser import build_firefox_options, create_driver
+from .output import save_to_csv, save_failures
+from .geo import SpatialIndex, coordinates_from_url
+from .record import PlaceRecord
@@ -0,0 +1,313 @@
+import argparse
+import collections
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from . import http_engine
+
+# Archive of the raw search and place HTML, so new fields or fixed selectors can be re-extracted offline
+# instead of scraping again. One SQLite file holds:
+#   blobs         content-addressed pages (sha256 of the HTML), compressed with a shared dictionary
+#   pages         index (kind, key, day) -> blob; one page per place ID (or search URL) per UTC day
+#   dictionaries  the shared dictionaries, trained from the first pages archived
+# Pages of one site share most of their markup, so a dictionary trained on a few of them shrinks each page
+# several times more than compressing it alone. zstd is used when the optional zstandard package is
+# installed (pip install gmapscraper[archive]), zlib with a preset dictionary otherwise.
+
+KIND_PLACE = 'place'
+KIND_SEARCH = 'search'
+
+ZSTD_LEVEL = 10
+ZLIB_LEVEL = 9
+DICT_SIZE = 112 * 1024  # zstd dictionary size; zlib can only use the last 32 KB
+ZLIB_DICT_SIZE = 32 * 1024
+TRAIN_AFTER = 64  # Pages archived before a dictionary is trained
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (sha256 TEXT PRIMARY KEY, codec TEXT NOT NULL, dict_id INTEGER, size INTEGER NOT NULL, data BLOB NOT NULL);
+CREATE TABLE IF NOT EXISTS pages (kind TEXT NOT NULL, key TEXT NOT NULL, day TEXT NOT NULL, url TEXT, sha256 TEXT NOT NULL,
+                                  fetched_at REAL NOT NULL, PRIMARY KEY (kind, key, day));
+CREATE INDEX IF NOT EXISTS pages_sha256 ON pages (sha256);
+CREATE TABLE IF NOT EXISTS dictionaries (id INTEGER PRIMARY KEY, codec TEXT NOT NULL, data BLOB NOT NULL, created_at REAL NOT NULL);
+"""
+
+# Function to import zstandard if it is installed (None otherwise)
+def load_zstd():
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+# Function to build a zlib preset dictionary: markup fragments shared by most sample pages, the most
+# common last (zlib finds matches closest to the end of the dictionary cheapest)
+def train_zlib_dictionary(samples, size=ZLIB_DICT_SIZE):
+    counts = collections.Counter()
+    for sample in samples:
+        counts.update(set(fragment + '>' for fragment in sample.split('>') if 8 <= len(fragment) <= 2048))
+    common = [fragment for fragment, count in counts.most_common() if count * 2 >= len(samples)]
+    dictionary = b''
+    for fragment in common:
+        encoded = fragment.encode('utf-8')
+        if len(dictionary) + len(encoded) > size:
+            break
+        dictionary = encoded + dictionary
+    return dictionary
+
+# Page key: the feature ID for place pages (stable across queries), the URL otherwise
+def page_key(kind, url):
+    if kind == KIND_PLACE:
+        return http_engine.feature_id_from_url(url) or url
+    return url
+
+# Compressed page store. Safe to share between threads (one connection behind a lock); other processes
+# open their own PageArchive on the same file (WAL mode lets readers run while a scrape is writing)
+class PageArchive:
+    def __init__(self, path, readonly=False, codec=None, train_after=TRAIN_AFTER):
+        self.path = path
+        self.readonly = readonly
+        self.zstd = load_zstd()
+        if codec is None:
+            codec = 'zstd' if self.zstd else 'zlib'
+        if codec == 'zstd' and self.zstd is None:
+            raise ImportError("zstd compression needs zstandard: pip install 'gmapscraper[archive]' (or pip install zstandard)")
+        if codec not in ('zstd', 'zlib'):
+            raise ValueError(f"Unknown codec: {codec!r} (expected 'zstd' or 'zlib')")
+        self.codec = codec
+        self.train_after = train_after
+        self.lock = threading.Lock()
+        if readonly:
+            self.db = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        else:
+            self.db = sqlite3.connect(path, check_same_thread=False)
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.executescript(SCHEMA)
+            self.db.commit()
+        self.dictionaries = {}  # dict id -> raw dictionary bytes
+        self.compressors = {}  # dict id -> reusable zstd compressor
+        self.decompressors = {}  # dict id -> reusable zstd decompressor
+        self.dict_id = self._latest_dictionary()
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def _latest_dictionary(self):
+        row = self.db.execute("SELECT id FROM dictionaries WHERE codec = ? ORDER BY id DESC LIMIT 1", (self.codec,)).fetchone()
+        return row[0] if row else None
+
+    def _dictionary(self, dict_id):
+        if dict_id not in self.dictionaries:
+            row = self.db.execute("SELECT data FROM dictionaries WHERE id = ?", (dict_id,)).fetchone()
+            if row is None:
+                raise KeyError(f"archive {self.path} has no dictionary {dict_id}")
+            self.dictionaries[dict_id] = bytes(row[0])
+        return self.dictionaries[dict_id]
+
+    def _compress(self, data):
+        if self.codec == 'zstd':
+            compressor = self.compressors.get(self.dict_id)
+            if compressor is None:
+                dict_data = self.zstd.ZstdCompressionDict(self._dictionary(self.dict_id)) if self.dict_id else None
+                compressor = self.compressors[self.dict_id] = self.zstd.ZstdCompressor(level=ZSTD_LEVEL, dict_data=dict_data)
+            return compressor.compress(data)
+        if self.dict_id:
+            compressor = zlib.compressobj(ZLIB_LEVEL, zdict=self._dictionary(self.dict_id))
+        else:
+            compressor = zlib.compressobj(ZLIB_LEVEL)
+        return compressor.compress(data) + compressor.flush()
+
+    def _decompress(self, codec, dict_id, data):
+        if codec == 'zstd':
+            if self.zstd is None:
+                raise ImportError("this archive holds zstd pages; reading them needs zstandard (pip install zstandard)")
+            decompressor = self.decompressors.get(dict_id)
+            if decompressor is None:
+                dict_data = self.zstd.ZstdCompressionDict(self._dictionary(dict_id)) if dict_id else None
+                decompressor = self.decompressors[dict_id] = self.zstd.ZstdDecompressor(dict_data=dict_data)
+            return decompressor.decompress(data)
+        if dict_id:
+            decompressor = zlib.decompressobj(zdict=self._dictionary(dict_id))
+        else:
+            decompressor = zlib.decompressobj()
+        return decompressor.decompress(data) + decompressor.flush()
+
+    # Archive one page; returns False if this key already has a page for today (identical HTML is stored once)
+    def store(self, kind, url, html, key=None):
+        key = key or page_key(kind, url)
+        day = time.strftime('%Y-%m-%d', time.gmtime())
+        data = html.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        with self.lock:
+            if self.db.execute("SELECT 1 FROM pages WHERE kind = ? AND key = ? AND day = ?", (kind, key, day)).fetchone():
+                return False
+            if not self.db.execute("SELECT 1 FROM blobs WHERE sha256 = ?", (digest,)).fetchone():
+                self.db.execute("INSERT INTO blobs VALUES (?, ?, ?, ?, ?)",
+                                (digest, self.codec, self.dict_id, len(data), self._compress(data)))
+            self.db.execute("INSERT INTO pages VALUES (?, ?, ?, ?, ?, ?)", (kind, key, day, url, digest, time.time()))
+            self.db.commit()
+            untrained = self.dict_id is None and self.train_after and self._count() >= self.train_after
+        if untrained:
+            try:
+                self.train()
+            except Exception as e:
+                print(f"Could not train an archive dictionary: {str(e)}. Pages stay compressed without one.")
+                self.train_after = None
+        return True
+
+    # Archive a page during a scrape: archive errors are reported, never raised, so they can't fail a place
+    def record(self, kind, url, html):
+        try:
+            return self.store(kind, url, html)
+        except Exception as e:
+            print(f"Could not archive {kind} page {url}: {str(e)}")
+            return False
+
+    def _count(self):
+        return self.db.execute("SELECT COUNT(*) FROM blobs").fetchone()[0]
+
+    # Train a new shared dictionary from recently archived pages; later pages are compressed with it
+    # (pages stored before keep the dictionary they were written with)
+    def train(self, samples=200, size=DICT_SIZE):
+        with self.lock:
+            rows = self.db.execute("SELECT codec, dict_id, data FROM blobs ORDER BY rowid DESC LIMIT ?", (samples,)).fetchall()
+            pages = [self._decompress(codec, dict_id, bytes(data)) for codec, dict_id, data in rows]
+            if len(pages) < 2:
+                return None
+            if self.codec == 'zstd':
+                dictionary = self.zstd.train_dictionary(size, pages).as_bytes()
+            else:
+                dictionary = train_zlib_dictionary([page.decode('utf-8', 'replace') for page in pages])
+            if not dictionary:
+                return None
+            cursor = self.db.execute("INSERT INTO dictionaries (codec, data, created_at) VALUES (?, ?, ?)",
+                                     (self.codec, dictionary, time.time()))
+            self.db.commit()
+            self.dict_id = cursor.lastrowid
+            self.dictionaries[self.dict_id] = dictionary
+        print(f"Trained a {len(dictionary) // 1024} KB {self.codec} dictionary from {len(pages)} archived pages.")
+        return self.dict_id
+
+    # HTML of one archived blob
+    def load(self, digest):
+        with self.lock:
+            row = self.db.execute("SELECT codec, dict_id, data FROM blobs WHERE sha256 = ?", (digest,)).fetchone()
+            if row is None:
+                raise KeyError(f"no archived page {digest}")
+            return self._decompress(row[0], row[1], bytes(row[2])).decode('utf-8')
+
+    # Index rows (key, day, url, sha256) of one kind; latest=True keeps only the newest day per key
+    def pages(self, kind=KIND_PLACE, latest=True, since=None):
+        query = "SELECT key, MAX(day), url, sha256 FROM pages WHERE kind = ?" if latest else "SELECT key, day, url, sha256 FROM pages WHERE kind = ?"
+        params = [kind]
+        if since:
+            query += " AND day >= ?"
+            params.append(since)
+        if latest:
+            query += " GROUP BY key"  # SQLite takes the bare columns from the row holding MAX(day)
+        with self.lock:
+            return self.db.execute(query + " ORDER BY key", params).fetchall()
+
+    def stats(self):
+        with self.lock:
+            pages = dict(self.db.execute("SELECT kind, COUNT(*) FROM pages GROUP BY kind").fetchall())
+            blobs, raw, stored = self.db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(data)), 0) FROM blobs").fetchone()
+            dictionaries = self.db.execute("SELECT COUNT(*) FROM dictionaries").fetchone()[0]
+        return {'pages': pages, 'blobs': blobs, 'raw_bytes': raw, 'stored_bytes': stored,
+                'ratio': round(raw / stored, 1) if stored else None, 'dictionaries': dictionaries, 'codec': self.codec}
+
+# Re-extraction runs one read-only archive per worker process
+_worker_archive = None
+
+def _open_worker_archive(path):
+    global _worker_archive
+    _worker_archive = PageArchive(path, readonly=True)
+
+# Function to re-extract a batch of archived place pages in a worker process; returns (records, failed urls)
+def _extract_batch(batch):
+    from bs4 import BeautifulSoup
+    from . import extraction
+    from .scraper import stamp_record
+    records = []
+    failed = []
+    for key, day, url, digest in batch:
+        try:
+            soup = BeautifulSoup(_worker_archive.load(digest), 'html.parser')
+            record = extraction.extract_place(soup)
+            soup.decompose()
+        except Exception as e:
+            failed.append({'url': url, 'error_type': 'extraction', 'attempts': 1, 'error': f"{day}: {str(e)}"})
+            continue
+        if not record['name']:
+            failed.append({'url': url, 'error_type': 'extraction', 'attempts': 1, 'error': f"{day}: place heading not found"})
+            continue
+        record['scraped_at'] = day  # When the page was archived, not when it was re-extracted
+        records.append(stamp_record(record, url))
+    return records, failed
+
+# Function to re-run the current extraction spec over archived place pages with a process pool
+# Returns (records, failures) like a scrape; pages of a place on earlier days are skipped unless latest=False
+def reextract(path, workers=None, batch_size=100, latest=True, since=None):
+    from concurrent.futures import ProcessPoolExecutor
+    with PageArchive(path, readonly=True) as archive:
+        rows = archive.pages(KIND_PLACE, latest=latest, since=since)
+    batches = [rows[start:start + batch_size] for start in range(0, len(rows), batch_size)]
+    workers = workers or os.cpu_count() or 1
+    print(f"Re-extracting {len(rows)} archived place pages with {workers} workers...")
+    started = time.monotonic()
+    results = []
+    failures = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_open_worker_archive, initargs=(path,)) as executor:
+        for records, failed in executor.map(_extract_batch, batches):
+            results.extend(records)
+            failures.extend(failed)
+    print(f"Re-extracted {len(results)} places ({len(failures)} failed) in {time.monotonic() - started:.1f}s.")
+    return results, failures
+
+# Offline entry point: python -m gmapscraper.archive {stats,train,reextract} ARCHIVE ...
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m gmapscraper.archive", description="Inspect a page archive (--archive) or re-extract places from it offline.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    stats = commands.add_parser("stats", help="Page counts and compression ratio")
+    stats.add_argument("archive")
+    train = commands.add_parser("train", help="Train a new shared dictionary from the latest pages")
+    train.add_argument("archive")
+    train.add_argument("--samples", type=int, default=200, help="Pages to train on. Default: 200")
+    rerun = commands.add_parser("reextract", help="Run the current extraction spec over the archived place pages")
+    rerun.add_argument("archive")
+    rerun.add_argument("-o", "--output", default="reextracted.csv", help="CSV file for results. Default: reextracted.csv")
+    rerun.add_argument("--failures-file", default="reextract_failures.csv", help="CSV file for pages that could not be extracted. Default: reextract_failures.csv")
+    rerun.add_argument("--workers", type=int, default=None, help="Worker processes. Default: one per CPU")
+    rerun.add_argument("--all-days", action="store_true", help="Extract every archived day of each place, not only the latest")
+    rerun.add_argument("--since", default=None, help="Only pages archived on or after this UTC day (YYYY-MM-DD)")
+    args = parser.parse_args(argv)
+    if not os.path.exists(args.archive):
+        parser.error(f"no archive at {args.archive}")
+
+    if args.command == "stats":
+        with PageArchive(args.archive, readonly=True) as archive:
+            for name, value in archive.stats().items():
+                print(f"{name}: {value}")
+    elif args.command == "train":
+        with PageArchive(args.archive) as archive:
+            archive.train(samples=args.samples)
+    else:
+        from .output import save_to_csv, save_failures
+        results, failures = reextract(args.archive, workers=args.workers, latest=not args.all_days, since=args.since)
+        save_to_csv(results, args.output)
+        if failures:
+            save_failures(failures, args.failures_file)
+
+if __name__ == "__main__":
+    main()
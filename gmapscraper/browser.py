@@ -0,0 +1,124 @@
+import time
+
+# Firefox setup for the Selenium engine. Nothing here runs at import time:
+# the browser is only started when a scrape actually needs it.
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/115.0"
+
+# Prefs that switch off Firefox's own background traffic (telemetry, remote settings/CRLite downloads,
+# safe-browsing updates, Pocket/spocs, MARS top sites, OHTTP ads config, captive portal checks, newtab feeds),
+# so startup is quicker and the network is spent on Maps only
+HARDENED_PREFS = {
+    # Telemetry, health report and studies
+    "toolkit.telemetry.enabled": False,
+    "toolkit.telemetry.unified": False,
+    "toolkit.telemetry.archive.enabled": False,
+    "toolkit.telemetry.server": "data:,",
+    "toolkit.telemetry.newProfilePing.enabled": False,
+    "toolkit.telemetry.shutdownPingSender.enabled": False,
+    "toolkit.telemetry.firstShutdownPing.enabled": False,
+    "toolkit.telemetry.updatePing.enabled": False,
+    "toolkit.telemetry.bhrPing.enabled": False,
+    "datareporting.healthreport.uploadEnabled": False,
+    "datareporting.policy.dataSubmissionEnabled": False,
+    "app.normandy.enabled": False,
+    "app.normandy.api_url": "",
+    "app.shield.optoutstudies.enabled": False,
+    "messaging-system.rsexperimentloader.enabled": False,
+    # Remote settings and CRLite/intermediate certificate downloads
+    "services.settings.server": "data:,",
+    "security.remote_settings.crlite_filters.enabled": False,
+    "security.remote_settings.intermediates.enabled": False,
+    "security.pki.crlite_mode": 0,
+    # Safe browsing list updates and lookups
+    "browser.safebrowsing.malware.enabled": False,
+    "browser.safebrowsing.phishing.enabled": False,
+    "browser.safebrowsing.blockedURIs.enabled": False,
+    "browser.safebrowsing.downloads.enabled": False,
+    "browser.safebrowsing.downloads.remote.enabled": False,
+    "browser.safebrowsing.provider.google4.updateURL": "",
+    "browser.safebrowsing.provider.google4.gethashURL": "",
+    "browser.safebrowsing.provider.mozilla.updateURL": "",
+    # Pocket, sponsored stories (spocs), MARS top sites, unified ads and the rest of the newtab feeds
+    "extensions.pocket.enabled": False,
+    "browser.newtabpage.enabled": False,
+    "browser.newtab.preload": False,
+    "browser.newtabpage.activity-stream.feeds.section.topstories": False,
+    "browser.newtabpage.activity-stream.feeds.system.topstories": False,
+    "browser.newtabpage.activity-stream.feeds.topsites": False,
+    "browser.newtabpage.activity-stream.feeds.telemetry": False,
+    "browser.newtabpage.activity-stream.telemetry": False,
+    "browser.newtabpage.activity-stream.showSponsored": False,
+    "browser.newtabpage.activity-stream.showSponsoredTopSites": False,
+    "browser.newtabpage.activity-stream.discoverystream.enabled": False,
+    "browser.newtabpage.activity-stream.unifiedAds.tiles.enabled": False,
+    "browser.newtabpage.activity-stream.unifiedAds.spocs.enabled": False,
+    "browser.topsites.contile.enabled": False,
+    "browser.urlbar.quicksuggest.enabled": False,
+    "browser.startup.page": 0,  # Blank start page
+    "browser.startup.homepage": "about:blank",
+    # Captive portal and connectivity checks
+    "network.captive-portal-service.enabled": False,
+    "network.connectivity-service.enabled": False,
+    # Update, add-on, search-engine, region and media plugin checks
+    "app.update.auto": False,
+    "app.update.checkInstallTime": False,
+    "extensions.update.enabled": False,
+    "extensions.getAddons.cache.enabled": False,
+    "extensions.systemAddon.update.enabled": False,
+    "browser.discovery.enabled": False,
+    "browser.search.update": False,
+    "browser.region.update.enabled": False,
+    "browser.region.network.url": "",
+    "media.gmp-manager.url": "",
+    "media.gmp-gmpopenh264.enabled": False,
+    "identity.fxaccounts.enabled": False,
+    "dom.push.connection.enabled": False,
+}
+
+# Function to configure Selenium with headless Firefox (tuned for Termux/ARM)
+# With harden=False only the basic options are set (for debugging a pref that breaks a page)
+def build_firefox_options(harden=True):
+    from selenium.webdriver.firefox.options import Options  # Use Firefox options
+    firefox_options = Options()
+    firefox_options.add_argument("--headless")  # Headless mode
+    firefox_options.add_argument("--no-sandbox")  # Required in Termux
+    firefox_options.add_argument("--disable-dev-shm-usage")  # Overcome limited /dev/shm in Android
+    firefox_options.add_argument("--disable-gpu")  # Disable GPU (helps on ARM)
+    firefox_options.add_argument(f"user-agent={USER_AGENT}")
+    firefox_options.add_argument("--lang=en-US")  # Ensure English for consistent loading
+    firefox_options.set_preference("dom.min_background_timeout_value", 0)  # Don't throttle timers in background tabs (--tabs)
+    firefox_options.set_preference("dom.timeout.enable_budget_throttling", False)
+    if harden:
+        for name, value in HARDENED_PREFS.items():
+            firefox_options.set_preference(name, value)
+    return firefox_options
+
+# Function to start the WebDriver (GeckoDriver should be in PATH)
+def create_driver(firefox_options=None, geckodriver_path=None):
+    from selenium import webdriver
+    from selenium.webdriver.firefox.service import Service
+    if firefox_options is None:
+        firefox_options = build_firefox_options()
+    # If GeckoDriver is not in PATH, pass its path, e.g. /data/data/com.termux/files/usr/bin/geckodriver
+    service = Service(executable_path=geckodriver_path) if geckodriver_path else None
+    print("Starting headless Firefox...")
+    started = time.monotonic()
+    driver = webdriver.Firefox(options=firefox_options, service=service)
+    print(f"Firefox started in {time.monotonic() - started:.2f}s")
+    return driver
+
+# Function to compare Firefox startup time with and without HARDENED_PREFS (median of `runs` launches each)
+def measure_startup(runs=3, geckodriver_path=None):
+    timings = {}
+    for harden in (False, True):
+        samples = []
+        for _ in range(runs):
+            started = time.monotonic()
+            driver = create_driver(build_firefox_options(harden=harden), geckodriver_path=geckodriver_path)
+            samples.append(time.monotonic() - started)
+            driver.quit()
+        samples.sort()
+        timings['hardened' if harden else 'default'] = samples[len(samples) // 2]
+    print(f"Firefox startup (median of {runs}): default prefs {timings['default']:.2f}s, hardened prefs {timings['hardened']:.2f}s")
+    return timings
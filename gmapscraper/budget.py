@@ -0,0 +1,87 @@
+import time
+
+# Wall-clock budget for a run (--deadline). Per-scroll and per-place costs are measured live
+# (exponential moving averages), and the remaining time is split between scrolling the feed for more
+# links and visiting the links already found, so the run stops on its own with everything flushed.
+
+# Function to parse a duration like "90", "45s", "20m", "1h30m" or "7d" into seconds
+def parse_duration(text):
+    text = str(text).strip().lower()
+    if not text:
+        raise ValueError("empty duration")
+    if text.replace('.', '', 1).isdigit():
+        return float(text)
+    total = 0.0
+    number = ''
+    for char in text:
+        if char.isdigit() or char == '.':
+            number += char
+        elif char in 'wdhms' and number:
+            total += float(number) * {'w': 604800, 'd': 86400, 'h': 3600, 'm': 60, 's': 1}[char]
+            number = ''
+        else:
+            raise ValueError(f"invalid duration: {text!r}")
+    if number:
+        raise ValueError(f"missing unit after {number!r} in {text!r}")
+    return total
+
+class Deadline:
+    def __init__(self, seconds, place_cost_guess=8.0, scroll_cost_guess=5.0, smoothing=0.3):
+        self.seconds = seconds
+        self.started = time.monotonic()
+        self.ends = self.started + seconds
+        self.place_cost = place_cost_guess  # Seconds per finished place (amortized over tabs and retries)
+        self.scroll_cost = scroll_cost_guess  # Seconds per deep-scan scroll step
+        self.smoothing = smoothing
+        self.places_measured = 0
+        self.stopped = False
+        self._last_place_done = None
+
+    def remaining(self):
+        return max(self.ends - time.monotonic(), 0.0)
+
+    def expired(self):
+        return time.monotonic() >= self.ends
+
+    # End the budget now (e.g. the service is shutting down): every scrape loop stops at its next check,
+    # reporting the places it didn't get to as usual
+    def stop(self):
+        self.ends = min(self.ends, time.monotonic())
+        self.stopped = True
+
+    def _average(self, current, sample, measured):
+        return sample if not measured else current + self.smoothing * (sample - current)
+
+    # Record how long one scroll step took
+    def record_scroll(self, seconds):
+        self.scroll_cost = self._average(self.scroll_cost, seconds, True)
+
+    # Decide whether another scroll is worth it: only if the time left after it covers more visits
+    # than the links already found still need
+    def should_scroll(self, links_to_visit):
+        after_scroll = self.remaining() - self.scroll_cost
+        if after_scroll <= 0:
+            return False
+        return after_scroll / self.place_cost > links_to_visit
+
+    # Mark the start of the visiting phase (place costs are measured between completions from here)
+    def start_visits(self):
+        self._last_place_done = time.monotonic()
+
+    # Record a finished (or finally failed) place
+    def place_done(self):
+        now = time.monotonic()
+        if self._last_place_done is not None:
+            self.place_cost = self._average(self.place_cost, now - self._last_place_done, self.places_measured)
+            self.places_measured += 1
+        self._last_place_done = now
+
+    # Whether another place can still be finished before the deadline
+    def can_visit(self):
+        return self.remaining() >= self.place_cost
+
+    def summary(self):
+        used = time.monotonic() - self.started
+        if self.stopped:
+            return f"stopped after {used:.0f}s, ~{self.place_cost:.1f}s/place"
+        return f"used {used:.0f}s of {self.seconds:.0f}s budget, ~{self.place_cost:.1f}s/place"
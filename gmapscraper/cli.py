@@ -0,0 +1,202 @@
+import argparse  # For better arg parsing and -h help
+import contextlib
+import importlib.util
+import os
+import signal
+from . import http_engine
+from .budget import parse_duration
+
+# Output files
+output_file = 'urls_scraped.csv'  # Generalized filename
+failures_file = 'urls_failed.csv'  # Places that still failed after all retries
+changes_file = 'urls_changes.csv'  # --refresh change log
+reviews_file = 'urls_reviews.csv'  # --reviews output
+
+# Function to build the command-line parser (cheap: no browser, Selenium or network imports)
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="gmapscraper",
+        description="Google Maps URL Scraper: Scrapes business/place URLs from Google Maps for a specified country and optional city, with dynamic coordinates, zoom, and deep scanning.",
+        epilog="Examples:\n"
+               "  gmapscraper business 10 --country Pakistan --city Karachi -t 3  # Scrapes 10 businesses in Karachi, Pakistan with 3s delay\n"
+               "  gmapscraper restaurant 20 --country USA --city \"New York\"  # Scrapes 20 restaurants in New York, USA (default 5s delay)\n"
+               "  gmapscraper hotel 15 --country India  # Scrapes 15 hotels in India (country-level, no city)\n"
+               "  gmapscraper -h  # Shows this help guide\n"
+               "(python -m gmapscraper and python map7.py accept the same arguments)",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("term", nargs="?", default="business", help="Search term (e.g., 'business', 'restaurant'). Default: 'business'")
+    parser.add_argument("num", nargs="?", type=int, default=50, help="Maximum number of results to scrape. Default: 50")
+    parser.add_argument("--country", default="Pakistan", help="Country to focus the search on (e.g., 'USA', 'India'). Default: 'Pakistan'")
+    parser.add_argument("--city", default=None, help="Optional city within the country (e.g., 'Karachi', 'New York'). If provided, search focuses on the city.")
+    parser.add_argument("-t", "--sleep", type=int, default=5, help="Sleep delay in seconds for loading (lower = faster, but riskier). Default: 5")
+    parser.add_argument("--tabs", type=int, default=1, help="Load place pages in this many tabs of one browser and harvest them round-robin (hides page-load latency without extra Firefox processes). Default: 1")
+    parser.add_argument("--engine", choices=["selenium", "http"], default="selenium", help="'http' reads the data embedded in the first results page over a pooled HTTP session (about 20 places, no rendering) and falls back to Selenium for anything it can't read. Default: selenium")
+    parser.add_argument("--base-url", default=http_engine.MAPS_BASE_URL, help=f"Maps host to query; point it at a local server to run against saved pages. Default: {http_engine.MAPS_BASE_URL}")
+    parser.add_argument("--capture-xhr", action="store_true", help="Decode the feed's own search responses while scrolling and skip detail visits for places they already describe (selenium engine).")
+    parser.add_argument("--retries", type=int, default=2, help="Extra attempts per failed place (with exponential backoff) before it goes to the failure report. Default: 2")
+    parser.add_argument("--deadline", type=duration_arg, default=None, help="Wall-clock budget for the run, e.g. 900, 15m or 1h30m. Scrolling and place visits are planned from measured costs, and everything gathered is saved when time runs out.")
+    parser.add_argument("--dedup-radius", type=float, default=0, help="Drop places whose name matches another place within this many meters (0 = off). Default: 0")
+    parser.add_argument("--index-file", default=None, help="JSON spatial index of collected places (lat/lng from the place URLs); created or extended on every run.")
+    parser.add_argument("-o", "--output", default=output_file, help=f"CSV file for results. Default: {output_file}")
+    parser.add_argument("--archive", default=None, help="Keep the raw search and place pages, compressed, in this SQLite file for offline re-extraction (python -m gmapscraper.archive reextract FILE).")
+    parser.add_argument("--clean", action="store_true", help="Also write a cleaned copy of the results (deduped address segments, city/postcode/country and website domain columns) to <output>_clean.csv. Needs pandas.")
+    parser.add_argument("--refresh", metavar="PREVIOUS_CSV", default=None, help="Compare with a previous run's results by place ID: only new places and places older than --stale-after are visited, the rest are reused. Places no longer in the feed count as removed, but only when the feed was read to its end (not blocked or cut at num/--deadline).")
+    parser.add_argument("--stale-after", type=duration_arg, default=7 * 86400, help="With --refresh, visit places again once their scraped_at is this old, e.g. 3d, 1w, 12h. Default: 7d")
+    parser.add_argument("--changes-file", default=changes_file, help=f"With --refresh, CSV log of added, removed and modified places. Default: {changes_file}")
+    parser.add_argument("--reviews", action="store_true", help="Also harvest the reviews of every visited place page into --reviews-file (one row per review, keyed by place_id). Places the HTTP engine answers without a browser get no reviews.")
+    parser.add_argument("--max-reviews", type=int, default=100, help="With --reviews, stop after this many reviews per place (0 = all). Default: 100")
+    parser.add_argument("--reviews-since", type=since_arg, default=None, help="With --reviews, skip reviews older than this: a date (2025-01-31) or an age (90d, 6w). Reviews are then sorted newest first so the harvest stops at the first older one.")
+    parser.add_argument("--reviews-file", default=reviews_file, help=f"With --reviews, CSV file for the reviews. Default: {reviews_file}")
+    parser.add_argument("--failures-file", default=failures_file, help=f"CSV file for places that still failed after all retries. Default: {failures_file}")
+    parser.add_argument("--profile-dir", default=None, help="Reuse this Firefox profile across runs (warm HTTP cache, cookies/consent). Parallel runs get a copy. Default: fresh temporary profile")
+    parser.add_argument("--cache-size", type=int, default=256, help="Disk cache limit in MB for --profile-dir. Default: 256")
+    parser.add_argument("--cache-max-age", type=int, default=14, help="Delete cache entries unused for this many days when the profile is opened. Default: 14")
+    parser.add_argument("--no-harden", action="store_true", help="Keep Firefox's background services (telemetry, remote settings, safe browsing, Pocket, ...) enabled.")
+    parser.add_argument("--startup-benchmark", type=int, metavar="RUNS", default=0, help="Only measure Firefox startup with default vs hardened prefs over RUNS launches, then exit.")
+    parser.add_argument("--geckodriver", default=None, help="Path to geckodriver if it is not in PATH (e.g. /data/data/com.termux/files/usr/bin/geckodriver)")
+    return parser
+
+# Function to parse --deadline for argparse
+def duration_arg(text):
+    try:
+        seconds = parse_duration(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    if seconds <= 0:
+        raise argparse.ArgumentTypeError("must be positive")
+    return seconds
+
+# Function to parse --reviews-since for argparse
+def since_arg(text):
+    from .reviews import parse_since
+    try:
+        return parse_since(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a date (YYYY-MM-DD) or an age such as 90d, got {text!r}")
+
+# Turn SIGTERM (e.g. a cron/container timeout) into the same clean stop as Ctrl+C, so results gathered so far are saved
+def stop_on_sigterm(signum, frame):
+    raise KeyboardInterrupt
+
+# Function to validate arguments that argparse can't check by itself
+def validate_args(parser, args):
+    if args.num < 1:
+        parser.error("num must be at least 1")
+    if args.tabs < 1:
+        parser.error("--tabs must be at least 1")
+    if args.retries < 0:
+        parser.error("--retries can't be negative")
+    if args.sleep < 0:
+        parser.error("--sleep can't be negative")
+    if args.startup_benchmark < 0:
+        parser.error("--startup-benchmark can't be negative")
+    if args.dedup_radius < 0:
+        parser.error("--dedup-radius can't be negative")
+    if args.cache_size < 1:
+        parser.error("--cache-size must be at least 1 MB")
+    if args.max_reviews < 0:
+        parser.error("--max-reviews can't be negative")
+    if args.refresh and not os.path.exists(args.refresh):
+        parser.error(f"--refresh: no such file: {args.refresh}")
+    if args.clean and importlib.util.find_spec("pandas") is None:
+        parser.error("--clean needs pandas: pip install 'gmapscraper[clean]'")
+
+# Function to construct the search query and the location to geocode
+def build_query(term, country, city=None):
+    if city:
+        location = f"{city}, {country}"
+        query = f"{term}s in {city}, {country}" if not term.endswith('s') else f"{term} in {city}, {country}"
+    else:
+        location = country
+        query = f"{term}s in {country}" if not term.endswith('s') else f"{term} in {country}"
+    return query, location
+
+# Function to dedup results spatially and add them to the persisted spatial index
+def index_results(results, dedup_radius=0, index_file=None):
+    from .geo import SpatialIndex
+    if dedup_radius:
+        kept = SpatialIndex().add_unique(results, dedup_radius)
+        if len(kept) < len(results):
+            print(f"Dropped {len(results) - len(kept)} near-identical places (same name within {dedup_radius:g} m).")
+        results = kept
+    if index_file:
+        index = SpatialIndex.load(index_file) if os.path.exists(index_file) else SpatialIndex()
+        # Places already in the index from earlier runs are not added twice
+        index.add_unique(results, dedup_radius or 1)
+        index.save(index_file)
+    return results
+
+# Main execution: parse and validate first, then geocode, and only start Firefox once a scrape needs it
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    validate_args(parser, args)
+    
+    if args.startup_benchmark:
+        from .browser import measure_startup
+        measure_startup(runs=args.startup_benchmark, geckodriver_path=args.geckodriver)
+        return
+    
+    # Heavy modules are only imported once the arguments are known to be valid
+    from .output import save_to_csv, save_failures
+    from .session import Scraper
+    from .pages import SearchOutcome
+    from .budget import Deadline
+    from .refresh import load_previous, save_changes
+    from .record import peak_memory_mb
+    from .reviews import ReviewHarvester
+    
+    # Read before scraping: the output file is usually the previous run's file itself
+    previous = load_previous(args.refresh) if args.refresh else None
+    
+    # The budget covers the whole run, geocoding and browser startup included
+    deadline = Deadline(args.deadline, place_cost_guess=args.sleep + 3) if args.deadline else None
+    
+    query, location = build_query(args.term, args.country, args.city)
+    sleep_time = args.sleep
+    max_results = args.num
+    
+    # Reviews are written while places are visited; the file is closed (and counted) however the run ends
+    reviews = ReviewHarvester(args.reviews_file, max_reviews=args.max_reviews, since=args.reviews_since) if args.reviews else contextlib.nullcontext()
+    
+    # The Scraper starts Firefox on first use (the HTTP engine may never need it) and closes it on exit
+    with reviews as review_harvester, Scraper(engine=args.engine, sleep_time=sleep_time, tabs=args.tabs, max_attempts=args.retries + 1, capture_xhr=args.capture_xhr,
+                 base_url=args.base_url, geckodriver_path=args.geckodriver, harden=not args.no_harden,
+                 profile_dir=args.profile_dir, cache_size_mb=args.cache_size, cache_max_age_days=args.cache_max_age, archive=args.archive,
+                 review_harvester=review_harvester) as scraper:
+        # Get dynamic coordinates
+        lat, lng = scraper.geocode(location)
+        
+        print(f"Using query: '{query}' with max_results: {max_results}, sleep: {sleep_time}s, and coordinates: {lat}, {lng}")
+        
+        signal.signal(signal.SIGTERM, stop_on_sigterm)
+        if args.refresh:
+            results, changes = scraper.refresh(query, previous, stale_after=args.stale_after, lat=lat, lng=lng, city=args.city, max_results=max_results, deadline=deadline)
+            failures = scraper.last_failures
+        else:
+            results, failures = scraper.search(query, lat, lng, city=args.city, max_results=max_results, deadline=deadline)
+        if args.dedup_radius or args.index_file:
+            results = index_results(results, args.dedup_radius, args.index_file)
+        # A blocked search (CAPTCHA, consent, timeout) says nothing about the places: keep the previous file
+        keep_previous = not results and scraper.last_search_failed and os.path.exists(args.output)
+        if keep_previous:
+            print(f"Search page failed and found nothing; keeping the previous {args.output} instead of overwriting it.")
+        else:
+            save_to_csv(results, args.output)
+        if args.refresh:
+            save_changes(changes, args.changes_file)
+        if failures:
+            save_failures(failures, args.failures_file)
+        if args.clean and not keep_previous:
+            from .postprocess import clean_csv
+            clean_csv(args.output, os.path.splitext(args.output)[0] + '_clean.csv')
+        if scraper.last_outcome is not None and scraper.last_outcome != SearchOutcome.RESULTS:
+            print(f"Search outcome: {scraper.last_outcome.value}")
+        print(f"Scraping complete. Found {len(results)} places with URLs, {len(failures)} failed.")
+        peak_mb = peak_memory_mb()
+        if peak_mb is not None:
+            print(f"Peak memory: {peak_mb:.0f} MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+import re
+
+# Declarative extraction spec for place details pages.
+# Each field lists fallback selectors in priority order as (selector, source) pairs, where source is
+# 'text' for the element text or '@attr' for an attribute, then a post-processor and a default.
+# The spec is compiled once and every field is collected in a single walk over the parsed page.
+# Selectors are simple: tag, .class, [attr], [attr=value], [attr^=value], [attr*=value] (no combinators).
+# Bump the version whenever selectors change so archived pages can be re-extracted knowingly.
+
+# Function to trim whitespace (and drop empty strings)
+def clean_text(value):
+    value = ' '.join(value.split())
+    return value or None
+
+# Function to build a post-processor that strips a leading label like "Address: "
+def strip_label(*labels):
+    def post(value):
+        value = clean_text(value)
+        for label in labels:
+            if value and value.lower().startswith(label.lower()):
+                value = value[len(label):].strip()
+        return value or None
+    return post
+
+# Function to read the first number in a label like "4.5 stars" or "1,234 reviews"
+def first_number(cast):
+    def post(value):
+        match = re.search(r'\d[\d,.]*', value or '')
+        if not match:
+            return None
+        try:
+            return cast(match.group(0).replace(',', '').rstrip('.'))
+        except ValueError:
+            return None
+    return post
+
+EXTRACTION_SPEC = {
+    'version': 1,
+    'fields': {
+        'name': {
+            'selectors': [('h1.DUwDvf', 'text')],
+            'post': clean_text,
+            'default': None,  # Missing heading means the page didn't render; callers treat it as an error
+        },
+        'website': {
+            'selectors': [('a[data-item-id=authority]', '@href'), ('a[data-item-id*=authority]', '@href')],
+            'post': clean_text,
+            'default': 'No website available',
+        },
+        'address': {
+            'selectors': [('button[data-item-id=address]', '@aria-label'), ('div.Io6YTe', 'text')],
+            'post': strip_label('Address:'),
+            'default': 'N/A',
+        },
+        'phone': {
+            'selectors': [('button[data-item-id^=phone:tel:]', '@data-item-id'), ('button[data-item-id^=phone]', '@aria-label')],
+            'post': strip_label('phone:tel:', 'Phone:'),
+            'default': None,
+        },
+        'rating': {
+            'selectors': [('span.ceNzKf', '@aria-label'), ('span[role=img][aria-label*=stars]', '@aria-label')],
+            'post': first_number(float),
+            'default': None,
+        },
+        'reviews': {
+            'selectors': [('span[aria-label*=reviews]', '@aria-label')],
+            'post': first_number(int),
+            'default': None,
+        },
+        'category': {
+            'selectors': [('button.DkEaL', 'text')],
+            'post': clean_text,
+            'default': None,
+        },
+    },
+}
+
+SELECTOR_RE = re.compile(r'^([a-zA-Z][a-zA-Z0-9]*)?((?:\.[\w-]+)*)((?:\[[^\]]+\])*)$')
+ATTR_RE = re.compile(r'\[([\w-]+)(?:([*^]?=)["\']?([^\]"\']*)["\']?)?\]')
+
+# Function to compile one selector into (tag, classes, attribute tests)
+def compile_selector(selector):
+    match = SELECTOR_RE.match(selector.strip())
+    if not match:
+        raise ValueError(f"Unsupported selector: {selector!r}")
+    tag, classes, attrs = match.groups()
+    classes = set(c for c in classes.split('.') if c)
+    tests = [(name, op, value) for name, op, value in ATTR_RE.findall(attrs)]
+    return tag.lower() if tag else None, classes, tests
+
+# Function to test a compiled selector against a BeautifulSoup tag
+def selector_matches(element, classes, tests):
+    if classes and not classes.issubset(element.get('class') or ()):
+        return False
+    for name, op, expected in tests:
+        actual = element.get(name)
+        if actual is None:
+            return False
+        if isinstance(actual, list):
+            actual = ' '.join(actual)
+        if op == '=' and actual != expected:
+            return False
+        if op == '^=' and not actual.startswith(expected):
+            return False
+        if op == '*=' and expected not in actual:
+            return False
+    return True
+
+# Compiled form of a spec: per tag name, the (field, priority, classes, tests, source) rules to try
+class CompiledSpec:
+    def __init__(self, spec):
+        self.version = spec['version']
+        self.fields = spec['fields']
+        self.rules_by_tag = {}
+        for field, config in self.fields.items():
+            for priority, (selector, source) in enumerate(config['selectors']):
+                tag, classes, tests = compile_selector(selector)
+                self.rules_by_tag.setdefault(tag, []).append((field, priority, classes, tests, source))
+        self.any_tag_rules = self.rules_by_tag.pop(None, [])
+
+    # Collect every field in one traversal; a field stops looking once its first-choice selector has matched
+    def extract(self, soup):
+        best = {}  # field -> (priority, value)
+        for element in soup.find_all(True):
+            for field, priority, classes, tests, source in self.rules_by_tag.get(element.name, []) + self.any_tag_rules:
+                if field in best and best[field][0] <= priority:
+                    continue
+                if not selector_matches(element, classes, tests):
+                    continue
+                raw = element.get_text() if source == 'text' else element.get(source[1:])
+                value = self.fields[field]['post'](raw) if raw is not None else None
+                if value is not None:
+                    best[field] = (priority, value)
+            if len(best) == len(self.fields) and all(priority == 0 for priority, _ in best.values()):
+                break
+        return {field: best[field][1] if field in best else config['default'] for field, config in self.fields.items()}
+
+# Spec compiled once at import, shared by every page
+COMPILED_SPEC = CompiledSpec(EXTRACTION_SPEC)
+
+# Output columns in spec order (name, website, address first, as in the original CSV)
+FIELDNAMES = list(EXTRACTION_SPEC['fields'])
+
+# Function to extract all spec fields from a parsed place page
+def extract_place(soup, spec=COMPILED_SPEC):
+    return spec.extract(soup)
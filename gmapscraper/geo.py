@@ -0,0 +1,121 @@
+import json
+import math
+import os
+import re
+
+# Coordinates straight from place hrefs (the !3d<lat>!4d<lng> segments), plus an in-memory grid index
+# over collected places for radius/bbox queries and spatial dedup, persisted as JSON between runs.
+
+COORDS_RE = re.compile(r'!3d(-?\d+(?:\.\d+)?)!4d(-?\d+(?:\.\d+)?)')
+EARTH_RADIUS_M = 6371008.8
+METERS_PER_DEGREE = 111320.0
+
+# Function to read (lat, lng) out of a place URL; (None, None) if the URL carries no coordinates
+def coordinates_from_url(url):
+    match = COORDS_RE.search(url or '')
+    if not match:
+        return None, None
+    return float(match.group(1)), float(match.group(2))
+
+# Function to compute the great-circle distance in meters
+def haversine_m(lat1, lng1, lat2, lng2):
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(min(a, 1.0)))
+
+# Function to normalize a place name for duplicate checks ("Cafe X - Karachi" ~ "cafe x karachi")
+def name_key(name):
+    return ''.join(ch for ch in (name or '').casefold() if ch.isalnum())
+
+# Uniform grid over lat/lng: each cell holds the records whose point falls in it
+class SpatialIndex:
+    def __init__(self, cell_size_m=500):
+        self.cell_size_m = cell_size_m
+        self.cell_deg = cell_size_m / METERS_PER_DEGREE
+        self.cells = {}  # (row, col) -> list of records
+        self.count = 0
+
+    def _cell(self, lat, lng):
+        return int(math.floor(lat / self.cell_deg)), int(math.floor(lng / self.cell_deg))
+
+    def __len__(self):
+        return self.count
+
+    # Add a record with float 'lat'/'lng'; records without coordinates are skipped (returns False)
+    def insert(self, record):
+        lat, lng = record.get('lat'), record.get('lng')
+        if lat is None or lng is None:
+            return False
+        self.cells.setdefault(self._cell(lat, lng), []).append(record)
+        self.count += 1
+        return True
+
+    # Records inside a lat/lng box
+    def query_bbox(self, min_lat, min_lng, max_lat, max_lng):
+        row_min, col_min = self._cell(min_lat, min_lng)
+        row_max, col_max = self._cell(max_lat, max_lng)
+        found = []
+        for row in range(row_min, row_max + 1):
+            for col in range(col_min, col_max + 1):
+                for record in self.cells.get((row, col), ()):
+                    if min_lat <= record['lat'] <= max_lat and min_lng <= record['lng'] <= max_lng:
+                        found.append(record)
+        return found
+
+    # Records within radius_m meters of a point, nearest first
+    def query_radius(self, lat, lng, radius_m):
+        dlat = radius_m / METERS_PER_DEGREE
+        dlng = radius_m / (METERS_PER_DEGREE * max(math.cos(math.radians(lat)), 0.01))
+        hits = []
+        for record in self.query_bbox(lat - dlat, lng - dlng, lat + dlat, lng + dlng):
+            distance = haversine_m(lat, lng, record['lat'], record['lng'])
+            if distance <= radius_m:
+                hits.append((distance, record))
+        hits.sort(key=lambda hit: hit[0])
+        return [record for _, record in hits]
+
+    # An already indexed record with the same normalized name within radius_m (None if there is none)
+    def find_duplicate(self, record, radius_m=25):
+        if record.get('lat') is None or record.get('lng') is None:
+            return None
+        key = name_key(record.get('name'))
+        for other in self.query_radius(record['lat'], record['lng'], radius_m):
+            if name_key(other.get('name')) == key:
+                return other
+        return None
+
+    # Insert records, dropping near-identical entries (same name within radius_m); returns the kept records
+    def add_unique(self, records, radius_m=25):
+        kept = []
+        for record in records:
+            if self.find_duplicate(record, radius_m) is not None:
+                continue
+            self.insert(record)
+            kept.append(record)
+        return kept
+
+    # Persist the indexed records (the grid is rebuilt on load, which is cheap)
+    def save(self, path):
+        records = [dict(record) for cell in self.cells.values() for record in cell]
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'cell_size_m': self.cell_size_m, 'records': records}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)  # Never leave a half-written index behind
+        print(f"Spatial index with {self.count} places saved to {path}")
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        index = cls(cell_size_m=data.get('cell_size_m', 500))
+        for record in data.get('records', []):
+            index.insert(record)
+        return index
+
+# Function to fill in lat/lng from the place URL when a record doesn't have them yet
+def add_coordinates(record, place_url=None):
+    if record.get('lat') is None or record.get('lng') is None:
+        record['lat'], record['lng'] = coordinates_from_url(place_url or record.get('url'))
+    return record
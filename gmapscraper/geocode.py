@@ -0,0 +1,18 @@
+# Function to get location coordinates using free Nominatim API
+def get_location_coordinates(location):
+    import requests  # For Nominatim API (free geocoding)
+    try:
+        url = f"https://nominatim.openstreetmap.org/search?q={location}&format=json&limit=1"
+        response = requests.get(url, headers={"User-Agent": "Mozilla/5.0"})
+        response.raise_for_status()
+        data = response.json()
+        if data:
+            lat = data[0]['lat']
+            lng = data[0]['lon']
+            print(f"Geocoded '{location}' to coordinates: {lat}, {lng}")
+            return lat, lng
+        else:
+            raise ValueError("No coordinates found")
+    except Exception as e:
+        print(f"Geocoding failed for '{location}': {str(e)}. Falling back to Pakistan coordinates.")
+        return "30.3753", "69.3451"  # Default to Pakistan
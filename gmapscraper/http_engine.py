@@ -0,0 +1,186 @@
+import json
+import re
+import urllib.parse
+
+# Browserless engine: reads the place data Google already embeds in the initial HTML
+# (window.APP_INITIALIZATION_STATE) instead of rendering the page in Firefox.
+# Point base_url at a local server over saved pages to run against fixtures (see tests/test_http_engine.py).
+# requests is imported when the first session is made.
+
+MAPS_BASE_URL = 'https://www.google.com'
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/115.0"
+XSSI_PREFIX = ")]}'"  # Google prefixes its JSON payloads with this to block script inclusion
+
+# Function to build the Maps search URL (shared with the Selenium engine)
+def maps_search_url(query, lat, lng, city=None, base_url=MAPS_BASE_URL):
+    zoom = '12' if city else '6'  # Dynamic zoom: higher for cities to load more dense results
+    return f"{base_url}/maps/search/{query.replace(' ', '+')}/@{lat},{lng},{zoom}z"
+
+# Function to build a place URL from its feature ID (0x...:0x...)
+def maps_place_url(feature_id, base_url=MAPS_BASE_URL):
+    return f"{base_url}/maps/place/data=!4m2!3m1!1s{feature_id}?hl=en"
+
+# Feature ID segment of a place href (!1s0x...:0x...), stable across name/locale changes
+FEATURE_ID_RE = re.compile(r'!1s(0x[0-9a-fA-F]+:0x[0-9a-fA-F]+)')
+
+# Function to read the feature ID out of a place URL (None if it has none)
+def feature_id_from_url(url):
+    match = FEATURE_ID_RE.search(url or '')
+    return match.group(1) if match else None
+
+# Function to create a pooled HTTP session that keeps connections alive between requests
+def make_session(pool_size=10):
+    import requests  # Pooled keep-alive HTTP session (no browser needed)
+    from requests.adapters import HTTPAdapter
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({
+        'User-Agent': USER_AGENT,
+        'Accept-Language': 'en-US,en;q=0.9',  # Same locale as the --lang=en-US browser
+    })
+    return session
+
+# Function to fetch a page; returns None when Google answers with a consent page or CAPTCHA
+def fetch_page(session, url, timeout=20):
+    response = session.get(url, timeout=timeout)
+    response.raise_for_status()
+    if 'consent.google.' in response.url or '/sorry/' in response.url:
+        print(f"HTTP engine got an interstitial for {url}")
+        return None
+    return response.text
+
+# Function to pull the APP_INITIALIZATION_STATE array out of the page HTML
+def extract_app_state(html):
+    marker = html.find('APP_INITIALIZATION_STATE')
+    if marker == -1:
+        return None
+    start = html.find('[', marker)
+    if start == -1:
+        return None
+    try:
+        state, _ = json.JSONDecoder().raw_decode(html, start)  # Stops at the end of the array, ignores the rest of the script
+    except ValueError:
+        return None
+    return state
+
+# Function to decode a JSON payload that may carry the XSSI prefix
+def decode_payload(text):
+    if not isinstance(text, str):
+        return None
+    text = text.strip()
+    if text.startswith(XSSI_PREFIX):
+        text = text[len(XSSI_PREFIX):]
+    try:
+        return json.loads(text)
+    except ValueError:
+        return None
+
+# Function to decode a /search?tbm=map response, which may be wrapped as {"c":0,"d":")]}'..."}/*""*/
+def decode_search_response(text):
+    if not isinstance(text, str):
+        return None
+    text = text.strip()
+    if text.endswith('/*""*/'):
+        text = text[:-len('/*""*/')]
+    if text.startswith('{'):
+        try:
+            wrapper = json.loads(text)
+        except ValueError:
+            return None
+        text = wrapper.get('d') if isinstance(wrapper, dict) else None
+    return decode_payload(text)
+
+# Function to yield every prefixed JSON payload embedded as a string in the state array
+def iter_payloads(state):
+    stack = [state]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(node)
+        elif isinstance(node, str) and node.startswith(XSSI_PREFIX):
+            payload = decode_payload(node)
+            if payload is not None:
+                yield payload
+
+# Function to safely index into nested lists (None when any step is missing)
+def dig(node, *path):
+    for key in path:
+        if not isinstance(node, list) or not isinstance(key, int) or key >= len(node):
+            return None
+        node = node[key]
+    return node
+
+# Function to check that an array has the shape of a Maps place entry (name + coordinates)
+def is_place_array(place):
+    return isinstance(dig(place, 11), str) and isinstance(dig(place, 9, 2), (int, float))
+
+# Function to unwrap Google's /url?q=... redirect links
+def unwrap_link(link):
+    if isinstance(link, str) and link.startswith('/url?'):
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(link).query)
+        return query.get('q', [link])[0]
+    return link
+
+# Function to turn a place array into a result record (same fields as the Selenium engine)
+def decode_place(place, base_url=MAPS_BASE_URL):
+    address = dig(place, 39)
+    if not address:
+        parts = dig(place, 2)
+        address = ', '.join(p for p in parts if isinstance(p, str)) if isinstance(parts, list) else None
+    website = unwrap_link(dig(place, 7, 0))
+    category = dig(place, 13, 0)
+    feature_id = dig(place, 10)
+    return {
+        'name': dig(place, 11).strip(),
+        'website': website if isinstance(website, str) and website else 'No website available',
+        'address': address.strip() if isinstance(address, str) and address else 'N/A',
+        'lat': dig(place, 9, 2),
+        'lng': dig(place, 9, 3),
+        'rating': dig(place, 4, 7),
+        'reviews': dig(place, 4, 8),
+        'phone': dig(place, 178, 0, 0),
+        'category': category if isinstance(category, str) else None,
+        'url': maps_place_url(feature_id, base_url) if isinstance(feature_id, str) else None,
+    }
+
+# Function to find the place entries of a search results payload
+def search_places(payload):
+    places = []
+    for item in dig(payload, 0, 1) or []:
+        place = dig(item, 14)
+        if is_place_array(place):
+            places.append(place)
+    return places
+
+# Function to search over HTTP; returns records parsed from the embedded payload ([] if none could be read)
+# The raw page goes to the archive (archive.PageArchive) if one is given
+def http_search(session, search_url, max_results=50, base_url=MAPS_BASE_URL, archive=None):
+    html = fetch_page(session, search_url)
+    if html and archive is not None:
+        archive.record('search', search_url, html)
+    state = extract_app_state(html) if html else None
+    if state is None:
+        return []
+    records = []
+    for payload in iter_payloads(state):
+        for place in search_places(payload):
+            records.append(decode_place(place, base_url))
+            if len(records) >= max_results:
+                return records
+    return records
+
+# Function to fetch one place page over HTTP; returns None if the embedded data can't be read
+def http_place(session, place_url, base_url=MAPS_BASE_URL):
+    html = fetch_page(session, place_url)
+    state = extract_app_state(html) if html else None
+    if state is None:
+        return None
+    for payload in iter_payloads(state):
+        place = dig(payload, 6)
+        if is_place_array(place):
+            record = decode_place(place, base_url)
+            record['url'] = place_url
+            return record
+    return None
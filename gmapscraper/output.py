@@ -0,0 +1,24 @@
+import csv
+from . import extraction
+
+# CSV columns: the extraction spec's fields, the coordinates decoded from the place URL, the place ID
+# (feature ID) that identifies a place across runs and when it was scraped (UTC, ISO 8601)
+FIELDNAMES = extraction.FIELDNAMES + ['lat', 'lng', 'place_id', 'scraped_at']
+
+# Save results to CSV
+def save_to_csv(results, filename):
+    with open(filename, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDNAMES, extrasaction='ignore')
+        writer.writeheader()
+        for result in results:
+            writer.writerow(result)
+    print(f"Results saved to {filename}")
+
+# Save places that still failed after all retries
+def save_failures(failures, filename):
+    with open(filename, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=['url', 'error_type', 'attempts', 'error'])
+        writer.writeheader()
+        for failure in failures:
+            writer.writerow(failure)
+    print(f"Failure report saved to {filename}")
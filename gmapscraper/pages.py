@@ -0,0 +1,86 @@
+import time
+from enum import Enum
+
+# Fast page classification: instead of waiting the full timeout for a.hfpxzc, poll one small script
+# every ~100ms and stop as soon as the page is recognizably results, a single place, no results,
+# a consent interstitial or a CAPTCHA.
+
+# What a search page turned out to be
+class SearchOutcome(str, Enum):
+    RESULTS = 'results'  # Results feed with place links
+    SINGLE_PLACE = 'single_place'  # Search jumped straight to one place page
+    NO_RESULTS = 'no_results'  # Maps answered, but the query matched nothing
+    CONSENT = 'consent'  # Cookie consent interstitial that could not be accepted
+    CAPTCHA = 'captcha'  # "Unusual traffic" CAPTCHA page
+    TIMEOUT = 'timeout'  # None of the above appeared in time
+
+# JS that reports the current page state ('loading' until something recognizable is rendered)
+PAGE_STATE_SCRIPT = """
+var href = location.href;
+if (href.indexOf('consent.google.') !== -1 || document.querySelector('form[action*="consent.google"]')) return 'consent';
+if (href.indexOf('/sorry/') !== -1 || document.querySelector('#captcha-form, div.g-recaptcha, iframe[src*="recaptcha"]')) return 'captcha';
+if (document.querySelector('a.hfpxzc')) return 'results';
+if (document.querySelector('h1.DUwDvf')) return 'single_place';
+if (document.readyState === 'complete') {
+    var main = document.querySelector('div[role="main"]');
+    var text = main ? main.innerText : '';
+    if (text.indexOf("Google Maps can't find") !== -1 || text.indexOf('No results found') !== -1 ||
+        (document.querySelector('div[role="feed"]') && text.indexOf("reached the end of the list") !== -1)) return 'no_results';
+}
+return 'loading';
+"""
+
+# JS that clicks the "Accept all" button of a consent page; returns false if there is none
+ACCEPT_CONSENT_SCRIPT = """
+var buttons = Array.prototype.slice.call(document.querySelectorAll('form[action*="consent"] button, form[action*="consent"] input[type="submit"]'));
+var accept = /accept all|agree|i agree|alle akzeptieren|tout accepter|aceptar todo|accetta tutto/i;
+for (var i = 0; i < buttons.length; i++) {
+    var label = (buttons[i].getAttribute('aria-label') || '') + ' ' + (buttons[i].innerText || buttons[i].value || '');
+    if (accept.test(label)) { buttons[i].click(); return true; }
+}
+return false;
+"""
+
+# Function to read the current page state once (falls back to 'loading' if the page is mid-navigation)
+def page_state(driver):
+    try:
+        return driver.execute_script(PAGE_STATE_SCRIPT)
+    except Exception:
+        return 'loading'
+
+# Function to poll the page until it is classifiable; returns the state string or 'timeout'
+def wait_for_page_state(driver, timeout=30, poll_interval=0.1):
+    deadline = time.monotonic() + timeout
+    while True:
+        state = page_state(driver)
+        if state != 'loading':
+            return state
+        if time.monotonic() >= deadline:
+            return 'timeout'
+        time.sleep(poll_interval)
+
+# Function to accept a consent interstitial; returns True if a button was clicked
+def accept_consent(driver):
+    try:
+        clicked = driver.execute_script(ACCEPT_CONSENT_SCRIPT)
+    except Exception:
+        return False
+    if clicked:
+        print("Accepted Google consent page.")
+    return bool(clicked)
+
+# Function to classify a freshly loaded search page, accepting consent pages on the way
+# Returns a SearchOutcome within a few hundred milliseconds for consent/CAPTCHA/no-results pages
+def classify_search_page(driver, timeout=30, consent_attempts=2):
+    started = time.monotonic()
+    state = wait_for_page_state(driver, timeout=timeout)
+    while state == 'consent' and consent_attempts > 0:
+        consent_attempts -= 1
+        if not accept_consent(driver):
+            break
+        remaining = max(timeout - (time.monotonic() - started), 1)
+        time.sleep(0.5)  # Let the consent form submit and redirect back to Maps
+        state = wait_for_page_state(driver, timeout=remaining)
+    outcome = SearchOutcome(state)
+    print(f"Search page classified as '{outcome.value}' after {time.monotonic() - started:.2f}s.")
+    return outcome
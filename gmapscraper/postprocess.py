@@ -0,0 +1,225 @@
+import re
+import sys
+
+# Batch clean-up of scraped results with pandas string ops (one vectorized pass per step over a whole
+# column instead of Python per row): repeated address segments, native-script country names,
+# postcode/city/country columns, canonical website domains and shortener/redirect flags.
+# pandas and pyarrow are optional dependencies (pip install gmapscraper[clean]) imported on first use.
+# Columns are held as string[pyarrow], so the string ops run in Arrow's C++ kernels (RE2 regexes);
+# patterns here avoid lookarounds and backreferences where possible so they stay on that path.
+# Without pyarrow the same code runs on Python-backed strings, only slower.
+
+WEBSITE_SENTINEL = 'No website available'
+ADDRESS_SENTINEL = 'N/A'
+
+# Country names as Maps renders them in other locales -> English
+COUNTRY_NAMES = {
+    'باكستان': 'Pakistan',
+    'پاکستان': 'Pakistan',
+    'الهند': 'India',
+    'بھارت': 'India',
+    'भारत': 'India',
+    'الولايات المتحدة': 'United States',
+    'USA': 'United States',
+    'المملكة المتحدة': 'United Kingdom',
+    'الإمارات العربية المتحدة': 'United Arab Emirates',
+    'المملكة العربية السعودية': 'Saudi Arabia',
+    'بنگلہ دیش': 'Bangladesh',
+    'বাংলাদেশ': 'Bangladesh',
+    'افغانستان': 'Afghanistan',
+    'إيران': 'Iran',
+    'ایران': 'Iran',
+    'الصين': 'China',
+    'تركيا': 'Turkey',
+    'مصر': 'Egypt',
+}
+KNOWN_COUNTRIES = set(COUNTRY_NAMES.values()) | {
+    'Canada', 'Australia', 'Germany', 'France', 'Spain', 'Italy', 'Nepal', 'Sri Lanka', 'Qatar', 'Oman', 'Kuwait', 'Bahrain',
+}
+
+# Link shorteners and link-in-bio hosts whose target is not the business's own domain
+SHORTENER_DOMAINS = {
+    'bit.ly', 'goo.gl', 'g.page', 'maps.app.goo.gl', 'tinyurl.com', 't.co', 'ow.ly', 'is.gd', 'buff.ly', 'rebrand.ly',
+    'cutt.ly', 'shorturl.at', 'rb.gy', 'tiny.cc', 'bl.ink', 'linktr.ee', 'wa.me', 'l.facebook.com', 'lnkd.in',
+}
+TRACKING_PARAMS = r'utm_[a-z_]+|fbclid|gclid|gbraid|wbraid|msclkid|y_source|mc_cid|mc_eid|_ga|ref_src'
+REDIRECT_RE = r'/url\?|[?&](?:url|u|q|redirect|redirect_uri|dest|target)=https?(?:%3A|:)'
+POSTCODE = r'\d{5,6}|[A-Z]{1,2}\d[A-Z\d]? ?\d[A-Z]{2}'  # PK/IN/US style digits, UK style alphanumerics
+# A segment run repeated right after itself ("Lahore, Lahore", "Shop 3, Lahore, Shop 3, Lahore"); compiled, so
+# pandas runs it with Python's re on every version (RE2 has no lookbehind or backreference)
+REPEATED_RUN_RE = re.compile(r'(?:^|(?<=, ))([^,]{4,}(?:, [^,]+)*?),? \1\b')
+# Name before a postcode: "Islamabad 44220" names the city, "Sindh 75500"/"TX 78701" a region after the city
+ADDRESS_PARTS_RE = rf'(?:^|, )(?:(?P<before>[^,]+), )??(?P<lead>[^,]*?)\b(?P<postcode>{POSTCODE})\b[^,]*(?:, [^,]+)?$'
+KNOWN_REGIONS = {
+    'Sindh', 'Punjab', 'Khyber Pakhtunkhwa', 'Balochistan', 'Gilgit-Baltistan', 'Azad Kashmir', 'Azad Jammu and Kashmir',
+    'Islamabad Capital Territory', 'Andhra Pradesh', 'Arunachal Pradesh', 'Assam', 'Bihar', 'Chhattisgarh', 'Goa', 'Gujarat',
+    'Haryana', 'Himachal Pradesh', 'Jharkhand', 'Karnataka', 'Kerala', 'Madhya Pradesh', 'Maharashtra', 'Manipur', 'Meghalaya',
+    'Mizoram', 'Nagaland', 'Odisha', 'Rajasthan', 'Sikkim', 'Tamil Nadu', 'Telangana', 'Tripura', 'Uttar Pradesh',
+    'Uttarakhand', 'West Bengal', 'Delhi', 'Jammu and Kashmir', 'Ladakh', 'England', 'Scotland', 'Wales', 'Northern Ireland',
+}
+
+# Function to import pandas with a useful message when the optional dependency is missing
+def require_pandas():
+    try:
+        import pandas
+    except ImportError:
+        raise ImportError("Post-processing needs pandas: pip install 'gmapscraper[clean]' (or pip install pandas)") from None
+    return pandas
+
+# Function to pick the string dtype: Arrow-backed when pyarrow is installed
+def string_dtype():
+    import importlib.util
+    return 'string[pyarrow]' if importlib.util.find_spec('pyarrow') is not None else 'string'
+
+# Function to run a regex with named groups over a string Series; returns a DataFrame with one column
+# per group (NA where the row doesn't match). Arrow-backed columns use Arrow's extract_regex kernel
+def extract(series, pattern):
+    pd = require_pandas()
+    if getattr(series.dtype, 'storage', None) == 'pyarrow':
+        import pyarrow
+        import pyarrow.compute as pc
+        matches = pc.extract_regex(pyarrow.array(series.array), pattern)
+        names = [matches.type.field(i).name for i in range(matches.type.num_fields)]
+        return pd.DataFrame({name: pd.array(pc.struct_field(matches, [i]), dtype=series.dtype) for i, name in enumerate(names)},
+                            index=series.index)
+    return series.str.extract(pattern).astype(series.dtype)
+
+# Function to clean the address column; returns (address, city, postcode, country) Series
+def clean_addresses(address):
+    pd = require_pandas()
+    dtype = string_dtype()
+    address = address.astype(dtype).replace(ADDRESS_SENTINEL, pd.NA)
+    # Many rows share an address (chains, repeated scrapes), so clean each distinct value once and map back
+    codes, uniques = pd.factorize(address)
+    if not len(uniques):
+        # No real address at all (no rows, or every one N/A): every column stays NA
+        return tuple(pd.Series(pd.NA, index=address.index, dtype=dtype) for _ in range(4))
+    cleaned = clean_unique_addresses(pd.Series(uniques, dtype=dtype))
+    return tuple(pd.Series(column.array.take(codes, allow_fill=True), index=address.index) for column in cleaned)
+
+# Function to split addresses into one non-empty segment per row (index = address row) and flag
+# segments that repeat an earlier one in the same address (case-insensitive)
+def split_segments(address):
+    pd = require_pandas()
+    if getattr(address.dtype, 'storage', None) == 'pyarrow':
+        import pyarrow
+        import pyarrow.compute as pc
+        lists = pc.split_pattern(pyarrow.array(address.array), ',')
+        segments = pd.Series(pd.array(pc.list_flatten(lists), dtype=address.dtype),
+                             index=address.index[pc.list_parent_indices(lists).to_numpy()])
+    else:
+        segments = address.str.split(',').explode().astype(address.dtype)
+    segments = segments.str.strip()
+    segments = segments[segments.notna() & (segments != '')]
+    keys = pd.DataFrame({'row': segments.index, 'key': segments.str.lower().values})
+    return segments, keys.duplicated().values
+
+# Function to join the segments of each row back into one address (index = address row)
+# Segments are pivoted to one column per position and concatenated column by column, not row by row
+def join_segments(segments):
+    pd = require_pandas()
+    position = segments.groupby(level=0).cumcount().values
+    wide = pd.DataFrame({'row': segments.index, 'position': position, 'segment': segments.values}).pivot(
+        index='row', columns='position', values='segment')
+    joined = wide[0]
+    for column in wide.columns[1:]:
+        joined = joined.where(wide[column].isna(), joined + ', ' + wide[column])
+    return joined
+
+# Function to clean distinct address values; same return as clean_addresses
+def clean_unique_addresses(address):
+    if not address.notna().any():
+        return address, address.copy(), address.copy(), address.copy()  # Nothing to clean (no rows, or all N/A)
+    address = address.str.replace('،', ',', regex=False).str.replace(r'\s{2,}|[^\S ]', ' ', regex=True).str.strip()
+    # Native-script country names can only be in non-ASCII rows ("USA" is the one ASCII alias); they are
+    # whole segments, so each name is replaced literally as a segment (before a comma, or at the end)
+    native = address.str.contains(r'[^\x00-\x7f]|USA$', regex=True).fillna(False)
+    if native.any():
+        renamed = address[native]
+        for name in sorted(COUNTRY_NAMES, key=len, reverse=True):
+            renamed = renamed.str.replace(f'{name},', f'{COUNTRY_NAMES[name]},', regex=False)
+            at_end = renamed.str.endswith(name).fillna(False) & ~renamed.str.endswith(COUNTRY_NAMES[name]).fillna(False)
+            if at_end.any():
+                renamed[at_end] = renamed[at_end].str.slice(stop=-len(name)) + COUNTRY_NAMES[name]
+        address[native] = renamed
+
+    # Only rows with a repeated segment need work (most have none and keep their string as is):
+    # first a run of whole segments repeated straight after itself ("4 Jinnah Avenue, ... 44220 4 Jinnah
+    # Avenue, ... 44220") collapses to one copy, starting at a segment boundary so "New Delhi, Delhi" is
+    # left alone; then segments that repeat earlier ones are dropped and the row is re-joined
+    segments, repeated = split_segments(address)
+    rows = segments.index[repeated].unique()
+    # A run that repeats mid-segment ("..., Islamabad 44220 4 Jinnah Avenue, ...") has no duplicate
+    # segment; it starts with the first segment again, which str.find spots without a regex per row
+    first = extract(address, r'^(?P<first>[^,]{4,}),')['first']
+    has_first = first.notna().to_numpy()
+    again = [text.find(start, len(start)) != -1
+             for text, start in zip(address[has_first].to_numpy(dtype=object), first[has_first].to_numpy(dtype=object))]
+    rows = rows.union(address.index[has_first][again])
+    # Rows with empty or unspaced segments ("Eidgah Ground,, Shahid", "Lahore,Pakistan") are re-joined too
+    rows = rows.union(address.index[address.str.contains(r'^,|\s,|,(?:[^ ]|$)', regex=True).fillna(False)])
+    if len(rows):
+        # REPEATED_RUN_RE runs on Python's re, but only on this (usually small) subset
+        subset = address.loc[rows].astype(object).str.replace(REPEATED_RUN_RE, r'\1', regex=True).astype(address.dtype)
+        segments, repeated = split_segments(subset)
+        address.loc[rows] = join_segments(segments[~repeated]).reindex(rows).astype(address.dtype)
+
+    # The postcode's segment names the city ("4 Jinnah Avenue, Islamabad 44220, Pakistan" -> Islamabad) unless
+    # that name is a region, then the city is the segment before it ("New Delhi, Delhi 110037, India" -> New Delhi);
+    # without a match, the last postcode-looking token anywhere is still taken
+    parts = extract(address, ADDRESS_PARTS_RE)
+    postcode = parts['postcode']
+    missing = postcode.isna() & address.notna()
+    if missing.any():
+        postcode[missing] = extract(address[missing], rf'.*\b(?P<postcode>{POSTCODE})\b')['postcode']
+    lead = parts['lead'].str.strip()
+    is_region = lead.isin(KNOWN_REGIONS) | lead.str.fullmatch(r'[A-Z]{2}').fillna(False)
+    city = lead.where((lead != '') & ~is_region, parts['before'].str.strip())
+    last = extract(address, r'(?:^|,)\s*(?P<last>[^,]*)$')['last'].str.strip()
+    country = last.where(last.isin(KNOWN_COUNTRIES))
+    return address, city, postcode, country
+
+# Function to canonicalize the website column; returns (website, domain, is_shortener, is_redirect) Series
+def clean_websites(website):
+    pd = require_pandas()
+    website = website.astype(string_dtype()).replace(WEBSITE_SENTINEL, pd.NA).str.strip()
+    is_redirect = website.str.contains(f'(?i){REDIRECT_RE}', regex=True).fillna(False)
+    # Drop tracking parameters with their "?"/"&" (the next parameter keeps its own), then turn a leading "&"
+    # left behind into "?" and drop a dangling one
+    website = website.str.replace(rf'[?&](?i:{TRACKING_PARAMS})=[^&#]*', '', regex=True)
+    website = website.str.replace(r'^([^?#]*)&', r'\1?', regex=True)
+    website = website.str.replace(r'[?&]+(#|$)', r'\1', regex=True)
+    domain = extract(website, r'^(?i:[a-z][a-z0-9+.-]*://)?(?:[^@/]*@)?(?i:www\d?\.)?(?P<domain>[^/:?#]+)')['domain']
+    domain = domain.str.lower().str.rstrip('.')
+    is_shortener = domain.isin(SHORTENER_DOMAINS) & domain.notna()
+    return website, domain, is_shortener, is_redirect
+
+# Function to post-process results (list of records or a DataFrame) into a cleaned DataFrame with extra columns
+def clean_results(results):
+    pd = require_pandas()
+    df = results.copy() if isinstance(results, pd.DataFrame) else pd.DataFrame([dict(record) for record in results])
+    for column in ('name', 'website', 'address'):
+        if column not in df:
+            df[column] = pd.NA
+    df['address'], df['city'], df['postcode'], df['country'] = clean_addresses(df['address'])
+    df['website'], df['website_domain'], df['website_shortener'], df['website_redirect'] = clean_websites(df['website'])
+    return df
+
+# Function to clean a results CSV in chunks (bounded memory for millions of rows)
+def clean_csv(input_path, output_path, chunksize=500000):
+    pd = require_pandas()
+    rows = 0
+    for number, chunk in enumerate(pd.read_csv(input_path, dtype=string_dtype(), keep_default_na=False, chunksize=chunksize)):
+        cleaned = clean_results(chunk)
+        cleaned.to_csv(output_path, mode='w' if number == 0 else 'a', header=number == 0, index=False)
+        rows += len(cleaned)
+    print(f"Cleaned {rows} rows into {output_path}")
+    return rows
+
+# Usage: python -m gmapscraper.postprocess results.csv [cleaned.csv]
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        sys.exit("usage: python -m gmapscraper.postprocess INPUT.csv [OUTPUT.csv]")
+    source = sys.argv[1]
+    target = sys.argv[2] if len(sys.argv) == 3 else re.sub(r'(\.csv)?$', '_clean.csv', source, count=1)
+    clean_csv(source, target)
@@ -0,0 +1,132 @@
+import os
+import shutil
+import tempfile
+import time
+
+# Persistent Firefox profile shared across runs, so the Maps JS bundles, CSS and static assets stay in
+# the HTTP cache and cookie/consent state survives. The first session takes the profile directory itself
+# (guarded by a lock file); sessions that start while it is in use get a private copy (copy-on-start).
+
+LOCK_NAME = '.gmapscraper-lock'
+# Files Firefox holds open/locked while running; never copied into a session's private copy
+SKIP_ON_COPY = {'lock', 'parent.lock', '.parentlock', LOCK_NAME}
+EMPTY_LOCK_GRACE = 10  # Seconds an empty lock file still counts as held
+
+# Function to check whether a process is still alive (for stale lock files left by crashed runs)
+def pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Exists but belongs to someone else
+    except OSError:
+        return False
+    return True
+
+# Function to read the PID in a lock file (None if it is empty or unreadable)
+def lock_owner(lock_path):
+    try:
+        with open(lock_path) as f:
+            return int(f.read().strip())
+    except (OSError, ValueError):
+        return None
+
+# Function to take the profile lock; returns False if a live session already holds it
+# The PID is written to a temporary file that is then linked into place, so the lock never exists
+# without its owner: a session starting at the same moment can't mistake a fresh lock for a stale one
+def try_lock(profile_dir):
+    lock_path = os.path.join(profile_dir, LOCK_NAME)
+    fd, temp_path = tempfile.mkstemp(prefix=LOCK_NAME + '.', dir=profile_dir)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(str(os.getpid()))
+        for _ in range(2):
+            try:
+                os.link(temp_path, lock_path)
+                return True
+            except FileExistsError:
+                pass
+            owner = lock_owner(lock_path)
+            if owner is None:
+                # Empty lock from an older version mid-write; only stale once it has been empty for a while
+                try:
+                    if time.time() - os.path.getmtime(lock_path) < EMPTY_LOCK_GRACE:
+                        return False
+                except FileNotFoundError:
+                    continue  # Released meanwhile
+            elif pid_alive(owner):
+                return False
+            print(f"Removing stale profile lock left by process {owner or 'unknown'}.")
+            try:
+                os.remove(lock_path)
+            except FileNotFoundError:
+                pass
+        return False
+    finally:
+        os.remove(temp_path)
+
+# Function to delete HTTP cache entries that haven't been used for max_age_days
+def clean_stale_cache(profile_dir, max_age_days=14):
+    cutoff = time.time() - max_age_days * 86400
+    removed = 0
+    freed = 0
+    for sub in ('entries', 'doomed'):
+        folder = os.path.join(profile_dir, 'cache2', sub)
+        if not os.path.isdir(folder):
+            continue
+        for entry in os.scandir(folder):
+            try:
+                stat = entry.stat()
+                if sub == 'doomed' or stat.st_mtime < cutoff:
+                    os.remove(entry.path)
+                    removed += 1
+                    freed += stat.st_size
+            except OSError:
+                pass  # Entry vanished or is in use; leave it for next time
+    if removed:
+        print(f"Cleaned {removed} stale cache entries ({freed / 1048576:.1f} MB) from the profile.")
+    return removed
+
+# Profile handed to one browser session: either the shared directory (locked) or a private copy
+class ProfileLease:
+    def __init__(self, path, shared_dir, is_copy):
+        self.path = path
+        self.shared_dir = shared_dir
+        self.is_copy = is_copy
+
+    # Give the profile back: unlock the shared directory or delete the private copy
+    def release(self):
+        if self.is_copy:
+            shutil.rmtree(self.path, ignore_errors=True)
+        else:
+            try:
+                os.remove(os.path.join(self.shared_dir, LOCK_NAME))
+            except FileNotFoundError:
+                pass
+
+# Function to get a profile for a new session (creates the shared directory on first use)
+def open_profile(profile_dir, max_age_days=14):
+    profile_dir = os.path.abspath(os.path.expanduser(profile_dir))
+    os.makedirs(profile_dir, exist_ok=True)
+    if try_lock(profile_dir):
+        clean_stale_cache(profile_dir, max_age_days)
+        print(f"Using persistent Firefox profile: {profile_dir}")
+        return ProfileLease(profile_dir, profile_dir, is_copy=False)
+    
+    # Another session is using the profile: start from a copy of its warm cache and cookies
+    copy_dir = tempfile.mkdtemp(prefix='gmapscraper-profile-')
+    shutil.copytree(profile_dir, copy_dir, dirs_exist_ok=True, ignore=lambda folder, names: [n for n in names if n in SKIP_ON_COPY or n.startswith(LOCK_NAME)],
+                    ignore_dangling_symlinks=True)
+    print(f"Profile {profile_dir} is in use; this session runs on a copy at {copy_dir}")
+    return ProfileLease(copy_dir, profile_dir, is_copy=True)
+
+# Function to point Firefox options at a profile and bound its disk cache
+def apply_profile(firefox_options, profile_path, cache_size_mb=256):
+    firefox_options.add_argument("-profile")
+    firefox_options.add_argument(profile_path)
+    firefox_options.set_preference("browser.cache.disk.enable", True)
+    firefox_options.set_preference("browser.cache.disk.smart_size.enabled", False)  # Use our fixed limit
+    firefox_options.set_preference("browser.cache.disk.capacity", cache_size_mb * 1024)  # In KB
+    firefox_options.set_preference("browser.cache.disk.parent_directory", profile_path)  # Keep the cache inside the profile
+    return firefox_options
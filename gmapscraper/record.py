@@ -0,0 +1,112 @@
+import sys
+from collections.abc import MutableMapping
+
+from . import extraction
+
+# Compact place record for very large runs. A dict per place costs several hundred bytes of hash table
+# on top of its values; a __slots__ object holds the same fields in a fixed array. Values that repeat
+# across places are shared so all records point at one string object: categories, sentinels, the
+# scraped_at second, and the tail of the address (region/postcode and country, e.g. "Sindh 75500, Pakistan").
+# PlaceRecord is a MutableMapping, so code written for the dicts (record['name'], record.get('url'),
+# csv.DictWriter, dict(record)) keeps working; fields outside RECORD_FIELDS go to a small overflow dict.
+
+RECORD_FIELDS = extraction.FIELDNAMES + ['lat', 'lng', 'place_id', 'scraped_at', 'url']
+INTERNED_FIELDS = frozenset(['category', 'scraped_at'])  # Low-cardinality values (names, phones and sites are mostly unique)
+SHARED_VALUES = {value: value for value in ('No website available', 'N/A', '')}  # Sentinels of any field
+ADDRESS_TAIL_SEGMENTS = 2  # Trailing address segments shared by the places of one city
+
+_MISSING = object()
+_FIELD_SET = frozenset(RECORD_FIELDS)
+
+# One place, used like the dict it replaces
+class PlaceRecord(MutableMapping):
+    __slots__ = tuple(RECORD_FIELDS) + ('_address_tail', '_extra')
+
+    def __init__(self, values=(), **more):
+        for field in RECORD_FIELDS:
+            setattr(self, field, _MISSING)
+        self._address_tail = None
+        self._extra = None
+        self.update(values, **more)
+
+    def __getitem__(self, key):
+        if key in _FIELD_SET:
+            value = getattr(self, key)
+            if value is _MISSING:
+                raise KeyError(key)
+            if key == 'address' and self._address_tail is not None:
+                return f"{value}, {self._address_tail}"
+            return value
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def __setitem__(self, key, value):
+        if key in _FIELD_SET:
+            if isinstance(value, str):
+                value = sys.intern(value) if key in INTERNED_FIELDS else SHARED_VALUES.get(value, value)
+            if key == 'address':
+                value = self._pack_address(value)
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    # Split the address into its per-place head and a shared, interned tail
+    def _pack_address(self, address):
+        self._address_tail = None
+        if isinstance(address, str):
+            parts = address.rsplit(', ', ADDRESS_TAIL_SEGMENTS)
+            if len(parts) > ADDRESS_TAIL_SEGMENTS:
+                self._address_tail = sys.intern(', '.join(parts[1:]))
+                return parts[0]
+        return address
+
+    def __delitem__(self, key):
+        if key in _FIELD_SET:
+            if getattr(self, key) is _MISSING:
+                raise KeyError(key)
+            setattr(self, key, _MISSING)
+            if key == 'address':
+                self._address_tail = None
+        elif self._extra is not None and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+
+    def __iter__(self):
+        for field in RECORD_FIELDS:
+            if getattr(self, field) is not _MISSING:
+                yield field
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"PlaceRecord({dict(self)!r})"
+
+    # Pickling (process pools) goes through a plain dict
+    def __reduce__(self):
+        return (PlaceRecord, (dict(self),))
+
+# Function to turn a record into a PlaceRecord (records that already are one are returned as they are)
+def compact(record):
+    return record if isinstance(record, PlaceRecord) else PlaceRecord(record)
+
+# Function to report the process's peak memory in MB: peak resident set size where the platform reports it
+# (resource on Linux/macOS), else the peak of Python allocations traced by tracemalloc (None if neither)
+def peak_memory_mb():
+    try:
+        import resource
+    except ImportError:
+        resource = None
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024  # bytes on macOS, KB elsewhere
+    import tracemalloc
+    if tracemalloc.is_tracing():
+        return tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    return None
@@ -0,0 +1,126 @@
+import calendar
+import csv
+import time
+
+from . import extraction
+from . import http_engine
+from .record import compact
+
+# Incremental refresh (--refresh): a re-run of a query is compared with the previous run's CSV by place ID.
+# Places the previous run scraped recently enough are reused instead of visited, so a weekly refresh only
+# pays for new and stale places; the differences go to a change log of added, removed and modified places.
+
+CHANGE_ADDED = 'added'
+CHANGE_REMOVED = 'removed'
+CHANGE_MODIFIED = 'modified'
+
+# Fields compared between runs (the extracted ones; coordinates and timestamps are not changes)
+COMPARED_FIELDS = extraction.FIELDNAMES
+CHANGE_FIELDNAMES = ['change', 'place_id', 'name', 'field', 'old', 'new']
+NUMERIC_FIELDS = {'lat': float, 'lng': float, 'rating': float, 'reviews': int}
+
+# Function to give a CSV row back the types of a scraped record (empty cells were None, numbers were numbers)
+def typed_row(row):
+    for field, value in row.items():
+        if value == '':
+            row[field] = None
+        elif field in NUMERIC_FIELDS:
+            try:
+                row[field] = NUMERIC_FIELDS[field](value)
+            except (TypeError, ValueError):
+                pass
+    return row
+
+# Function to load a previous results CSV as {place_id: record}; rows without a place ID (CSVs written
+# before the column existed) can't be matched and are skipped
+def load_previous(filename):
+    previous = {}
+    skipped = 0
+    with open(filename, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            place_id = row.get('place_id') or http_engine.feature_id_from_url(row.get('url'))
+            if place_id:
+                previous[place_id] = compact(typed_row(row))  # A previous run can be as large as this one
+            else:
+                skipped += 1
+    if skipped:
+        print(f"Skipped {skipped} rows of {filename} without a place ID; those places count as new.")
+    print(f"Loaded {len(previous)} places from {filename}")
+    return previous
+
+# Function to read a scraped_at value ("2025-06-01T08:30:00Z" or a bare "2025-06-01") as epoch seconds (None if unreadable)
+def parse_timestamp(value):
+    for pattern in ('%Y-%m-%dT%H:%M:%SZ', '%Y-%m-%d'):
+        try:
+            return calendar.timegm(time.strptime(value or '', pattern))
+        except ValueError:
+            continue
+    return None
+
+# Function to pick the previous records that are still fresh (scraped less than stale_after seconds ago)
+def fresh_records(previous, stale_after, now=None):
+    now = time.time() if now is None else now
+    fresh = {}
+    for place_id, record in previous.items():
+        scraped_at = parse_timestamp(record.get('scraped_at'))
+        if scraped_at is not None and now - scraped_at < stale_after:
+            fresh[place_id] = record
+    return fresh
+
+# Values compare as their CSV text, so 4.5 from a scrape equals '4.5' read back from the previous file
+def field_text(value):
+    return '' if value is None else str(value).strip()
+
+# Function to compare a run with the previous one; returns (results, changes)
+# Places that are still listed but failed this time keep their previous record (and are not "removed")
+# Unless complete (the search listed every place of the query), a place missing from this run proves nothing:
+# a blocked or truncated search keeps every previous place it didn't see and reports none as removed
+def diff_results(previous, results, failures, complete=True):
+    results = list(results)
+    seen = set(record.get('place_id') for record in results)
+    carried = 0
+    for failure in failures:
+        place_id = http_engine.feature_id_from_url(failure.get('url'))
+        if place_id in previous and place_id not in seen:
+            results.append(previous[place_id])
+            seen.add(place_id)
+            carried += 1
+    unseen = 0
+    if not complete:
+        for place_id, old in previous.items():
+            if place_id not in seen:
+                results.append(old)
+                seen.add(place_id)
+                unseen += 1
+
+    changes = []
+    for record in results:
+        place_id = record.get('place_id')
+        old = previous.get(place_id)
+        if old is None:
+            changes.append({'change': CHANGE_ADDED, 'place_id': place_id, 'name': record.get('name')})
+            continue
+        for field in COMPARED_FIELDS:
+            if field_text(old.get(field)) != field_text(record.get(field)):
+                changes.append({'change': CHANGE_MODIFIED, 'place_id': place_id, 'name': record.get('name'),
+                                'field': field, 'old': old.get(field), 'new': record.get(field)})
+    for place_id, old in previous.items():
+        if place_id not in seen:
+            changes.append({'change': CHANGE_REMOVED, 'place_id': place_id, 'name': old.get('name')})
+
+    counts = {change: len(set(row['place_id'] for row in changes if row['change'] == change))
+              for change in (CHANGE_ADDED, CHANGE_MODIFIED, CHANGE_REMOVED)}
+    print(f"Refresh: {counts[CHANGE_ADDED]} added, {counts[CHANGE_MODIFIED]} modified, {counts[CHANGE_REMOVED]} removed"
+          + (f", {carried} failed places kept from the previous run." if carried else "."))
+    if unseen:
+        print(f"The search didn't list every place; {unseen} previous places it didn't reach are kept, not removed.")
+    return results, changes
+
+# Save the change log: one row per added or removed place, one per changed field of a modified place
+def save_changes(changes, filename):
+    with open(filename, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=CHANGE_FIELDNAMES)
+        writer.writeheader()
+        for change in changes:
+            writer.writerow(change)
+    print(f"Change log saved to {filename}")
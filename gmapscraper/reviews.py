@@ -0,0 +1,171 @@
+import calendar
+import csv
+import re
+import time
+
+from .budget import parse_duration
+
+# Streaming review harvester (--reviews). While a place page is open, its Reviews tab is scrolled step by
+# step; each step reads only the review nodes appended since the previous one (they are marked as done in
+# the page), so the work per place is linear in its number of reviews instead of re-parsing page_source
+# after every scroll. Reviews are written to their own CSV as they arrive, keyed by place ID.
+
+REVIEW_FIELDNAMES = ['place_id', 'review_id', 'author', 'rating', 'date', 'date_text', 'text']
+
+# Approximate length of the units in Maps' relative dates ("3 weeks ago", "a year ago")
+RELATIVE_UNITS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400, 'week': 7 * 86400, 'month': 30 * 86400, 'year': 365 * 86400}
+RELATIVE_DATE_RE = re.compile(r'\b(a|an|one|\d+)\s+(second|minute|hour|day|week|month|year)s?\s+ago', re.IGNORECASE)
+
+# JS that opens the Reviews tab of a place page; returns False if the page has none
+OPEN_REVIEWS_SCRIPT = """
+var tabs = document.querySelectorAll('button[role="tab"]');
+for (var i = 0; i < tabs.length; i++) {
+    var label = (tabs[i].getAttribute('aria-label') || tabs[i].textContent || '').toLowerCase();
+    if (label.indexOf('review') !== -1) { tabs[i].click(); return true; }
+}
+var fallback = document.querySelector('button[role="tab"][data-tab-index="1"]');
+if (fallback) { fallback.click(); return true; }
+return false;
+"""
+
+# JS that sorts the reviews newest first (needed to stop at a since-date); returns False if it can't
+SORT_NEWEST_SCRIPT = """
+var item = document.querySelector('div[role="menuitemradio"][data-index="1"]');
+if (!item) {
+    var sort = document.querySelector('button[aria-label*="Sort" i], button[data-value="Sort"]');
+    if (!sort) { return false; }
+    sort.click();
+    return null;  // Menu is opening; call again to pick the entry
+}
+item.click();
+return true;
+"""
+
+# JS for one harvest step: read the review nodes not seen yet (expanding their "More" text first), mark
+# them done, then scroll the pane that holds them so the next batch starts loading
+# Returns [[review_id, author, stars label, date text, text], ...]
+REVIEWS_STEP_SCRIPT = """
+var nodes = document.querySelectorAll('div.jftiEf[data-review-id]:not([data-gms-done])');
+var batch = [];
+for (var i = 0; i < nodes.length; i++) {
+    var node = nodes[i];
+    node.setAttribute('data-gms-done', '1');
+    var more = node.querySelector('button.w8nwRe');
+    if (more) { more.click(); }
+    var author = node.querySelector('div.d4r55');
+    var stars = node.querySelector('span.kvMYJc, span[role="img"][aria-label]');
+    var date = node.querySelector('span.rsqaWe');
+    var text = node.querySelector('span.wiI7pd');
+    batch.push([node.getAttribute('data-review-id'), author ? author.textContent : null,
+                stars ? stars.getAttribute('aria-label') : null, date ? date.textContent : null,
+                text ? text.textContent : null]);
+}
+var pane = document.querySelector('div.jftiEf[data-review-id]');
+while (pane && !(pane.scrollHeight > pane.clientHeight + 10 && /(auto|scroll)/.test(getComputedStyle(pane).overflowY))) {
+    pane = pane.parentElement;
+}
+if (pane) { pane.scrollTop = pane.scrollHeight; }
+return batch;
+"""
+
+# Function to turn a relative review date ("2 months ago", "Edited a year ago") into epoch seconds (None if unreadable)
+def parse_relative_date(text, now=None):
+    match = RELATIVE_DATE_RE.search(text or '')
+    if not match:
+        return None
+    count = 1 if match.group(1).lower() in ('a', 'an', 'one') else int(match.group(1))
+    return (time.time() if now is None else now) - count * RELATIVE_UNITS[match.group(2).lower()]
+
+# Function to parse --reviews-since: a date (YYYY-MM-DD) or a duration back from now ("90d", "6w"); returns epoch seconds
+def parse_since(text):
+    try:
+        return calendar.timegm(time.strptime(text.strip(), '%Y-%m-%d'))
+    except ValueError:
+        return time.time() - parse_duration(text)
+
+# Writes the reviews of every visited place to one CSV as they are harvested
+class ReviewHarvester:
+    def __init__(self, filename, max_reviews=100, since=None, scroll_pause=1.5, max_idle_steps=3):
+        self.filename = filename
+        self.max_reviews = max_reviews  # Per place; 0 means no cap
+        self.since = since  # Epoch seconds; older reviews are not harvested
+        self.scroll_pause = scroll_pause
+        self.max_idle_steps = max_idle_steps  # Steps without a new review before a place counts as done
+        self.total = 0
+        self.places = 0
+        self._file = open(filename, 'w', newline='', encoding='utf-8')
+        self._writer = csv.DictWriter(self._file, fieldnames=REVIEW_FIELDNAMES)
+        self._writer.writeheader()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+            print(f"{self.total} reviews of {self.places} places saved to {self.filename}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def _sort_newest(self, driver):
+        for _ in range(3):
+            sorted_newest = driver.execute_script(SORT_NEWEST_SCRIPT)
+            if sorted_newest is not None:
+                return sorted_newest
+            time.sleep(0.5)  # Sort menu still opening
+        return False
+
+    # Harvest the reviews of the place open in the current tab; returns how many were written
+    # Errors only end this place's reviews: they never fail the place itself
+    def harvest(self, driver, place_id):
+        written = 0
+        try:
+            if not driver.execute_script(OPEN_REVIEWS_SCRIPT):
+                print("No reviews tab on this place page.")
+                return 0
+            time.sleep(self.scroll_pause)
+            # Only newest-first order lets the harvest stop at the first review older than --reviews-since
+            stop_at_since = bool(self.since) and self._sort_newest(driver)
+            if stop_at_since:
+                time.sleep(self.scroll_pause)
+            seen = set()
+            idle_steps = 0
+            done = False
+            while not done and idle_steps < self.max_idle_steps:
+                batch = driver.execute_script(REVIEWS_STEP_SCRIPT) or []
+                rows = []
+                for review_id, author, stars, date_text, text in batch:
+                    if not review_id or review_id in seen:
+                        continue
+                    seen.add(review_id)
+                    date = parse_relative_date(date_text)
+                    if self.since and date is not None and date < self.since:
+                        if stop_at_since:
+                            done = True
+                            break
+                        continue
+                    rating = re.search(r'\d+(?:[.,]\d+)?', stars or '')
+                    rows.append({
+                        'place_id': place_id, 'review_id': review_id, 'author': (author or '').strip() or None,
+                        'rating': float(rating.group(0).replace(',', '.')) if rating else None,
+                        'date': time.strftime('%Y-%m-%d', time.gmtime(date)) if date is not None else None,
+                        'date_text': (date_text or '').strip() or None, 'text': (text or '').strip() or None,
+                    })
+                    if self.max_reviews and written + len(rows) >= self.max_reviews:
+                        done = True
+                        break
+                if rows:
+                    self._writer.writerows(rows)
+                    self._file.flush()  # Streamed: a crash keeps everything harvested so far
+                    written += len(rows)
+                idle_steps = 0 if batch else idle_steps + 1
+                if not done:
+                    time.sleep(self.scroll_pause)
+        except Exception as e:
+            print(f"Review harvest stopped after {written} reviews: {str(e).strip().splitlines()[0] if str(e).strip() else type(e).__name__}")
+        self.total += written
+        self.places += 1
+        print(f"Harvested {written} reviews.")
+        return written
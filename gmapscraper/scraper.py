@@ -0,0 +1,543 @@
+import time
+import heapq  # Retry queue ordered by backoff deadline
+import itertools
+from . import http_engine  # Browserless engine (--engine http)
+from . import extraction  # Declarative place-page extraction spec
+from .geo import add_coordinates  # lat/lng from the !3d/!4d segments of place URLs
+from .record import compact  # __slots__ records with interned repeated strings
+from .pages import SearchOutcome, classify_search_page, accept_consent
+
+# Selenium and BeautifulSoup are imported inside the functions that use them,
+# so importing this module (or running --help) never pays for them.
+
+# Error classes for per-place failures (used by the retry queue and the failure report)
+ERROR_TIMEOUT = 'timeout'  # Page or element did not load in time
+ERROR_MISSING_ELEMENT = 'missing_element'  # Page loaded but the expected element is missing/stale
+ERROR_NAVIGATION = 'navigation'  # driver.get() or the browser itself failed
+ERROR_INTERSTITIAL = 'interstitial'  # Google served a consent page or CAPTCHA instead of the place
+
+# Raised when a place page is replaced by a consent page or CAPTCHA
+class InterstitialError(Exception):
+    pass
+
+# Raised when a place page loads without its heading (not rendered yet or layout changed)
+class MissingElementError(Exception):
+    pass
+
+# Function to map an exception to one of the error classes above
+def classify_error(error):
+    from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
+    if isinstance(error, InterstitialError):
+        return ERROR_INTERSTITIAL
+    if isinstance(error, TimeoutException):
+        return ERROR_TIMEOUT
+    if isinstance(error, (MissingElementError, NoSuchElementException, StaleElementReferenceException)):
+        return ERROR_MISSING_ELEMENT
+    return ERROR_NAVIGATION
+
+# Function to detect consent pages and CAPTCHAs by the URL Google redirects to
+def is_interstitial(url):
+    return 'consent.google.' in url or '/sorry/' in url
+
+# Function to complete a record with its place ID (the feature ID in its URL), the UTC time it was scraped
+# and the coordinates from its URL; returns it as a compact record.PlaceRecord
+def stamp_record(record, place_url=None):
+    record = compact(record)
+    if place_url:
+        record['url'] = place_url
+    record['place_id'] = http_engine.feature_id_from_url(record.get('url'))
+    if not record.get('scraped_at'):
+        record['scraped_at'] = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+    return add_coordinates(record)
+
+# Function to parse a rendered place details page (all spec fields in one pass over the tree)
+def parse_place_page(page_source):
+    from bs4 import BeautifulSoup
+    place_soup = BeautifulSoup(page_source, 'html.parser')
+    record = extraction.extract_place(place_soup)
+    place_soup.decompose()  # Break the tree's reference cycles so it is freed now, not at the next GC pass
+    if not record['name']:
+        raise MissingElementError("Place heading (h1.DUwDvf) not found")
+    return record
+
+# Function to scrape a single place page (raises on failure so the caller can retry it)
+# Pages that parsed are kept in the archive (archive.PageArchive) if one is given, and their reviews are
+# streamed out while the page is still open if a review_harvester (reviews.ReviewHarvester) is given
+def scrape_place(driver, place_url, sleep_time=5, archive=None, review_harvester=None):
+    driver.get(place_url)
+    time.sleep(sleep_time)  # User-configurable delay for details page
+    if is_interstitial(driver.current_url):
+        accept_consent(driver)  # The retry then lands on the place itself
+        raise InterstitialError(f"Redirected to {driver.current_url}")
+    page_source = driver.page_source
+    record = parse_place_page(page_source)
+    if archive is not None:
+        archive.record('place', place_url, page_source)
+    record = stamp_record(record, place_url)
+    if review_harvester is not None:
+        review_harvester.harvest(driver, record['place_id'] or place_url)
+    return record
+
+# Function to re-queue a failed place with exponential backoff, or record it once attempts run out
+def retry_or_fail(queue, order, failures, place_url, attempt, error, max_attempts, backoff):
+    error_type = classify_error(error)
+    message = str(error).strip().splitlines()[0] if str(error).strip() else type(error).__name__
+    if attempt < max_attempts:
+        delay = backoff * 2 ** (attempt - 1)
+        print(f"Place failed ({error_type}): {message}. Retrying in {delay}s.")
+        heapq.heappush(queue, (time.time() + delay, next(order), place_url, attempt + 1))
+    else:
+        print(f"Place failed ({error_type}) after {attempt} attempts: {message}")
+        failures.append({'url': place_url, 'error_type': error_type, 'attempts': attempt, 'error': message})
+
+# Function to report places that were never finished because the run was interrupted
+def record_interrupted(failures, pending):
+    print("Interrupted; saving results gathered so far.")
+    for url, attempt in pending:
+        failures.append({'url': url, 'error_type': 'interrupted', 'attempts': attempt - 1, 'error': 'Run interrupted'})
+
+# Function to report places left unvisited because the --deadline budget ran out
+def record_out_of_time(failures, pending, deadline):
+    print(f"Deadline reached ({deadline.summary()}); {len(pending)} places left for a later run.")
+    for url, attempt in pending:
+        failures.append({'url': url, 'error_type': 'deadline', 'attempts': attempt - 1, 'error': 'Time budget exhausted'})
+
+# Generator that visits place pages with per-place error isolation and a retry queue
+# Records are yielded as they are scraped; failed places are re-queued with exponential backoff,
+# and places that exhaust max_attempts are appended to failures (the failure report)
+# With a deadline (budget.Deadline), no place is started that can't be finished in the time left
+def iter_places(driver, place_urls, failures, sleep_time=5, max_attempts=3, backoff=2, deadline=None, archive=None, review_harvester=None):
+    done = 0
+    total = len(place_urls)
+    # Heap of (ready_at, order, url, attempt): fresh places first, retries once their backoff has elapsed
+    order = itertools.count()
+    queue = [(0.0, next(order), url, 1) for url in place_urls]
+    if deadline:
+        deadline.start_visits()
+    
+    while queue:
+        ready_at, _, place_url, attempt = heapq.heappop(queue)
+        wait = ready_at - time.time()
+        if deadline and (not deadline.can_visit() or wait > deadline.remaining()):
+            record_out_of_time(failures, [(place_url, attempt)] + [(item[2], item[3]) for item in queue], deadline)
+            break
+        try:
+            if wait > 0:
+                time.sleep(wait)  # Only retries are left and none is due yet
+            print(f"Processing place {done + len(failures) + 1}/{total} (attempt {attempt}/{max_attempts})...")
+            result = scrape_place(driver, place_url, sleep_time=sleep_time, archive=archive, review_harvester=review_harvester)
+        except KeyboardInterrupt:
+            # Keep everything scraped so far; report the rest as not attempted
+            record_interrupted(failures, [(place_url, attempt)] + [(item[2], item[3]) for item in queue])
+            break
+        except Exception as e:
+            retry_or_fail(queue, order, failures, place_url, attempt, e, max_attempts, backoff)
+            if deadline and attempt >= max_attempts:
+                deadline.place_done()
+            continue
+        
+        if deadline:
+            deadline.place_done()
+        done += 1
+        print(f"Found: {result['name']} | Website: {result['website']}")
+        yield result
+
+# Function to visit place pages and collect (results, failures)
+def scrape_places(driver, place_urls, sleep_time=5, max_attempts=3, backoff=2, deadline=None, archive=None, review_harvester=None):
+    failures = []
+    results = list(iter_places(driver, place_urls, failures, sleep_time=sleep_time, max_attempts=max_attempts, backoff=backoff, deadline=deadline, archive=archive, review_harvester=review_harvester))
+    return results, failures
+
+# JS run in a tab to check whether its pending navigation has rendered the place page
+# The old document is tagged before navigating, so a tab still showing the previous place is never mistaken for ready
+TAB_STATE_SCRIPT = """
+var stale = document.documentElement.hasAttribute('data-gms-stale');
+return [stale, document.readyState, location.href, !!document.querySelector('h1.DUwDvf')];
+"""
+
+# JS run in a tab to start a navigation without blocking on the page load
+TAB_NAVIGATE_SCRIPT = """
+document.documentElement.setAttribute('data-gms-stale', '1');
+window.location.href = arguments[0];
+"""
+
+# Generator that visits place pages across several tabs of the same browser
+# Navigations are started in every tab, then each tab is harvested round-robin as soon as its page is ready
+# (don't drive the browser from the consumer between yields; the extra tabs are closed when the generator ends)
+def iter_places_multitab(driver, place_urls, failures, tabs=4, max_attempts=3, backoff=2, page_timeout=30, poll_interval=0.25, deadline=None, archive=None, review_harvester=None):
+    from selenium.common.exceptions import TimeoutException
+    done = 0
+    total = len(place_urls)
+    order = itertools.count()
+    queue = [(0.0, next(order), url, 1) for url in place_urls]
+    
+    # Open the extra tabs (window handles) in the current driver
+    main_handle = driver.current_window_handle
+    handles = [main_handle]
+    for _ in range(tabs - 1):
+        driver.switch_to.new_window('tab')
+        handles.append(driver.current_window_handle)
+    print(f"Harvesting with {len(handles)} tabs in one browser.")
+    busy = {}  # handle -> (url, attempt, started_at)
+    if deadline:
+        deadline.start_visits()
+    
+    try:
+        while queue or busy:
+            if deadline and deadline.expired():
+                # Out of time: whatever is still loading or queued goes to the report
+                record_out_of_time(failures, [(url, attempt) for url, attempt, _ in busy.values()] + [(item[2], item[3]) for item in queue], deadline)
+                break
+            progressed = False
+            for handle in handles:
+                if handle in busy:
+                    place_url, attempt, started_at = busy[handle]
+                    try:
+                        driver.switch_to.window(handle)
+                        stale, ready_state, current_url, has_heading = driver.execute_script(TAB_STATE_SCRIPT)
+                    except KeyboardInterrupt:
+                        raise
+                    except Exception:
+                        stale = True  # The tab is still unloading after TAB_NAVIGATE_SCRIPT: not ready yet (as in pages.page_state)
+                    try:
+                        if not stale and is_interstitial(current_url):
+                            accept_consent(driver)  # The retry then lands on the place itself
+                            raise InterstitialError(f"Redirected to {current_url}")
+                        if stale or ready_state != 'complete' or not has_heading:
+                            if time.time() - started_at > page_timeout:
+                                raise TimeoutException(f"Place page not ready after {page_timeout}s")
+                            continue
+                        page_source = driver.page_source
+                        result = stamp_record(parse_place_page(page_source), place_url)
+                        if archive is not None:
+                            archive.record('place', place_url, page_source)
+                        if review_harvester is not None:
+                            review_harvester.harvest(driver, result['place_id'] or place_url)
+                    except KeyboardInterrupt:
+                        raise
+                    except Exception as e:
+                        del busy[handle]
+                        retry_or_fail(queue, order, failures, place_url, attempt, e, max_attempts, backoff)
+                        if deadline and attempt >= max_attempts:
+                            deadline.place_done()
+                        progressed = True
+                        continue
+                    del busy[handle]
+                    if deadline:
+                        deadline.place_done()
+                    done += 1
+                    progressed = True
+                    print(f"[{done + len(failures)}/{total}] Found: {result['name']} | Website: {result['website']}")
+                    yield result
+                
+                # Idle tab: start the next place whose backoff (if any) has elapsed and that can finish in time
+                # (the per-place cost is amortized over the tabs, so a tab's own page takes about tabs x that)
+                if queue and queue[0][0] <= time.time() and not (deadline and deadline.remaining() < deadline.place_cost * len(handles)):
+                    _, _, place_url, attempt = heapq.heappop(queue)
+                    try:
+                        driver.switch_to.window(handle)
+                        driver.execute_script(TAB_NAVIGATE_SCRIPT, place_url)
+                    except KeyboardInterrupt:
+                        heapq.heappush(queue, (0.0, next(order), place_url, attempt))
+                        raise
+                    except Exception as e:
+                        retry_or_fail(queue, order, failures, place_url, attempt, e, max_attempts, backoff)
+                        continue
+                    busy[handle] = (place_url, attempt, time.time())
+                    progressed = True
+            
+            if not progressed:
+                if not busy and deadline and queue and queue[0][0] <= time.time():
+                    record_out_of_time(failures, [(item[2], item[3]) for item in queue], deadline)
+                    break
+                time.sleep(poll_interval)  # Every tab is still loading
+    except KeyboardInterrupt:
+        record_interrupted(failures, [(url, attempt) for url, attempt, _ in busy.values()] + [(item[2], item[3]) for item in queue])
+    finally:
+        # Close the extra tabs and go back to the original one
+        for handle in handles[1:]:
+            try:
+                driver.switch_to.window(handle)
+                driver.close()
+            except Exception:
+                pass
+        driver.switch_to.window(main_handle)
+
+# Function to visit place pages across several tabs and collect (results, failures)
+def scrape_places_multitab(driver, place_urls, tabs=4, max_attempts=3, backoff=2, page_timeout=30, poll_interval=0.25, deadline=None, archive=None, review_harvester=None):
+    failures = []
+    results = list(iter_places_multitab(driver, place_urls, failures, tabs=tabs, max_attempts=max_attempts, backoff=backoff, page_timeout=page_timeout, poll_interval=poll_interval, deadline=deadline, archive=archive, review_harvester=review_harvester))
+    return results, failures
+
+# JS that hooks XMLHttpRequest and fetch so the feed's /search?tbm=map responses are kept in the page
+# Google fetches ~20 places per response while the feed scrolls; the responses already hold full records
+XHR_CAPTURE_SCRIPT = """
+if (!window.__gmsHooked) {
+    window.__gmsHooked = true;
+    window.__gmsCaptured = [];
+    var keep = function (url) { return !!url && url.indexOf('/search?') !== -1 && url.indexOf('tbm=map') !== -1; };
+    var origOpen = XMLHttpRequest.prototype.open;
+    XMLHttpRequest.prototype.open = function (method, url) {
+        this.__gmsUrl = String(url);
+        return origOpen.apply(this, arguments);
+    };
+    var origSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        var xhr = this;
+        if (keep(xhr.__gmsUrl)) {
+            xhr.addEventListener('load', function () {
+                try { window.__gmsCaptured.push(xhr.responseText); } catch (e) {}
+            });
+        }
+        return origSend.apply(this, arguments);
+    };
+    var origFetch = window.fetch;
+    if (origFetch) {
+        window.fetch = function (input) {
+            var url = typeof input === 'string' ? input : (input && input.url);
+            var pending = origFetch.apply(this, arguments);
+            if (keep(url)) {
+                pending.then(function (response) {
+                    response.clone().text().then(function (text) { window.__gmsCaptured.push(text); });
+                }).catch(function () {});
+            }
+            return pending;
+        };
+    }
+}
+"""
+
+# JS that hands over the responses captured since the last call (keeps the in-page buffer small)
+XHR_DRAIN_SCRIPT = """
+var captured = window.__gmsCaptured || [];
+window.__gmsCaptured = [];
+return captured;
+"""
+
+# Function to add the places of already decoded search payloads to captured, keyed by feature ID
+def collect_payload_places(captured, payloads, base_url=http_engine.MAPS_BASE_URL):
+    for payload in payloads:
+        for place in http_engine.search_places(payload):
+            feature_id = http_engine.dig(place, 10)
+            if isinstance(feature_id, str) and feature_id not in captured:
+                captured[feature_id] = stamp_record(http_engine.decode_place(place, base_url))
+
+# Function to decode captured search response texts (the drained XHR bodies) into records keyed by feature ID
+def collect_captured_places(captured, responses, base_url=http_engine.MAPS_BASE_URL):
+    collect_payload_places(captured, (http_engine.decode_search_response(text) for text in responses), base_url)
+
+# Generator that visits place pages in the browser, one tab or several
+def iter_visit_places(driver, place_urls, failures, sleep_time=5, max_attempts=3, tabs=1, deadline=None, archive=None, review_harvester=None):
+    if tabs > 1:
+        return iter_places_multitab(driver, place_urls, failures, tabs=tabs, max_attempts=max_attempts, deadline=deadline, archive=archive, review_harvester=review_harvester)
+    return iter_places(driver, place_urls, failures, sleep_time=sleep_time, max_attempts=max_attempts, deadline=deadline, archive=archive, review_harvester=review_harvester)
+
+# Function to visit place pages in the browser and collect (results, failures)
+def visit_places(driver, place_urls, sleep_time=5, max_attempts=3, tabs=1, deadline=None, archive=None, review_harvester=None):
+    failures = []
+    results = list(iter_visit_places(driver, place_urls, failures, sleep_time=sleep_time, max_attempts=max_attempts, tabs=tabs, deadline=deadline, archive=archive, review_harvester=review_harvester))
+    return results, failures
+
+# Function to run the search phase: load the results feed and deep-scan it for place links
+# Returns (records, place_urls, failures, outcome, complete): records already decoded from the search responses (capture_xhr),
+# the place URLs that still need a detail visit, the SearchOutcome of the search page, and whether those are every
+# place of the query (the feed was scrolled to its end and not cut at max_results, a deadline or an interrupt)
+# With a deadline, scrolling stops once the time left is better spent visiting the links already found
+def harvest_search(driver, query, lat, lng, city=None, sleep_time=5, max_results=50, base_url=http_engine.MAPS_BASE_URL, capture_xhr=False, deadline=None, archive=None):
+    from selenium.webdriver.common.by import By
+    from bs4 import BeautifulSoup
+    url = http_engine.maps_search_url(query, lat, lng, city=city, base_url=base_url)
+    
+    print(f"Navigating to: {url}")
+    try:
+        driver.get(url)
+    except Exception as e:
+        print(f"Error loading search results: {str(e)}")
+        return [], [], [{'url': url, 'error_type': classify_error(e), 'attempts': 1, 'error': str(e).strip()}], SearchOutcome.TIMEOUT, False
+    
+    # Recognize results, a single place, no results, consent (auto-accepted) or CAPTCHA as soon as it renders
+    outcome = classify_search_page(driver, timeout=min(30, deadline.remaining()) if deadline else 30)
+    if outcome == SearchOutcome.NO_RESULTS:
+        print(f"No results for '{query}'.")
+        return [], [], [], outcome, True
+    if outcome == SearchOutcome.SINGLE_PLACE:
+        print("Search opened a single place page.")
+        return [], [driver.current_url], [], outcome, True
+    if outcome != SearchOutcome.RESULTS:
+        error_type = ERROR_TIMEOUT if outcome == SearchOutcome.TIMEOUT else ERROR_INTERSTITIAL
+        print(f"Search page blocked ({outcome.value}); nothing to scrape.")
+        return [], [], [{'url': url, 'error_type': error_type, 'attempts': 1, 'error': f"Search page: {outcome.value}"}], outcome, False
+    
+    # Find the sidebar/results pane: role='feed' first, then the 2025 XPath, then the body
+    # (results are already rendered at this point, so there is nothing left to wait for)
+    sidebar_xpath = '//*[@id="QA0Szd"]/div/div/div[1]/div[2]/div/div[1]/div/div/div[1]/div[1]'
+    candidates = driver.find_elements(By.CSS_SELECTOR, "div[role='feed']") or driver.find_elements(By.XPATH, sidebar_xpath)
+    if candidates:
+        sidebar = candidates[0]
+        print("Found results sidebar.")
+    else:
+        print("Fallback: Could not find the results sidebar. Scrolling document body instead.")
+        sidebar = driver.find_element(By.TAG_NAME, "body")  # Fallback to body
+    
+    captured = {}  # feature ID -> record decoded from the search responses
+    if capture_xhr:
+        try:
+            # The first page of results is embedded in the page; later pages arrive as XHR while scrolling
+            collect_payload_places(captured, http_engine.iter_payloads(driver.execute_script("return window.APP_INITIALIZATION_STATE || null")), base_url)
+            driver.execute_script(XHR_CAPTURE_SCRIPT)
+        except Exception as e:
+            print(f"Could not set up search response capture: {str(e)}")
+    
+    # Deep scanning: Scroll the sidebar deeply to load more results
+    # A failure here only stops scrolling; places already loaded are still processed
+    # An interrupt (Ctrl+C/SIGTERM) also stops the run: captured places are kept, the rest are reported
+    interrupted = False
+    feed_ended = False  # Only a feed scrolled to its end lists every place of the query
+    try:
+        last_height = driver.execute_script("return arguments[0].scrollHeight", sidebar)
+        last_count = len(driver.find_elements(By.CSS_SELECTOR, "a.hfpxzc"))  # Track place count
+        scroll_attempts = 0
+        max_scrolls = 40  # Increased for deeper unrestricted scanning
+        few_results_retries = 0
+        
+        while scroll_attempts < max_scrolls and last_count < max_results:
+            if deadline and not deadline.should_scroll(max(last_count - len(captured), 0)):
+                print(f"Stopping deep scan to leave time for visiting {last_count} places ({deadline.summary()}).")
+                break
+            scroll_started = time.monotonic()
+            driver.execute_script("arguments[0].scrollTo(0, arguments[0].scrollHeight)", sidebar)
+            time.sleep(sleep_time)  # User-configurable delay
+            new_height = driver.execute_script("return arguments[0].scrollHeight", sidebar)
+            new_count = len(driver.find_elements(By.CSS_SELECTOR, "a.hfpxzc"))
+            if capture_xhr:
+                collect_captured_places(captured, driver.execute_script(XHR_DRAIN_SCRIPT), base_url)
+            if deadline:
+                deadline.record_scroll(time.monotonic() - scroll_started)
+            
+            if new_height == last_height and new_count == last_count:
+                if new_count < 10 and few_results_retries < 5:  # Retry if too few loaded early
+                    print("Few results loaded; retrying scroll.")
+                    few_results_retries += 1
+                    time.sleep(sleep_time)
+                    continue
+                print("No more results to load after deep scan.")
+                feed_ended = True
+                break
+            
+            last_height = new_height
+            last_count = new_count
+            scroll_attempts += 1
+            print(f"Deep scan scroll {scroll_attempts}/{max_scrolls} complete. Current places loaded: {last_count}")
+    except KeyboardInterrupt:
+        interrupted = True
+    except Exception as e:
+        print(f"Deep scan interrupted ({classify_error(e)}): {str(e)}. Using places loaded so far.")
+    
+    # Parse page source with BeautifulSoup
+    try:
+        page_source = driver.page_source
+    except Exception:
+        if not interrupted:
+            raise
+        page_source = ''  # Ctrl+C reaches geckodriver too; the browser may already be gone
+    if archive is not None and page_source:
+        archive.record('search', url, page_source)
+    soup = BeautifulSoup(page_source, 'html.parser')
+    place_elements = soup.find_all('a', class_='hfpxzc')  # Confirmed 2025 selector for place links
+    
+    print(f"Found {len(place_elements)} place elements after deep scan.")
+    
+    place_urls = [place.get('href') for place in place_elements if place.get('href')]
+    complete = feed_ended and not interrupted and len(place_urls) <= max_results
+    place_urls = place_urls[:max_results]
+    # The feed's tree is the largest object of a run; release it before the detail visits start
+    soup.decompose()
+    del soup, place_elements, page_source
+    if not capture_xhr and not interrupted:
+        return [], place_urls, [], outcome, complete
+    
+    if not interrupted:
+        try:
+            collect_captured_places(captured, driver.execute_script(XHR_DRAIN_SCRIPT), base_url)
+        except Exception as e:
+            print(f"Could not read remaining search responses: {str(e)}")
+    print(f"Decoded {len(captured)} places from search responses.")
+    
+    # Places already decoded from the search responses need no detail visit
+    records = []
+    uncaptured_urls = []
+    for place_url in place_urls:
+        record = captured.pop(http_engine.feature_id_from_url(place_url), None)
+        if record:
+            records.append(stamp_record(record, place_url))
+        else:
+            uncaptured_urls.append(place_url)
+    # Captured places the DOM never rendered still count toward max_results
+    for record in captured.values():
+        if len(records) + len(uncaptured_urls) >= max_results:
+            break
+        records.append(record)
+    if interrupted:
+        failures = []
+        record_interrupted(failures, [(place_url, 1) for place_url in uncaptured_urls])
+        return records, [], failures, outcome, False
+    if uncaptured_urls:
+        print(f"{len(uncaptured_urls)} places are missing from the search responses and need a visit.")
+    return records, uncaptured_urls, [], outcome, complete
+
+# Function to scrape Google Maps (with enhanced deep scanning on sidebar)
+# Returns (results, failures); a failure in one place never drops the places after it
+# With capture_xhr, records are decoded from the feed's own search responses and only uncaptured places are visited
+def scrape_google_maps_urls(driver, query, lat, lng, city=None, sleep_time=5, max_results=50, max_attempts=3, tabs=1, base_url=http_engine.MAPS_BASE_URL, capture_xhr=False, deadline=None, archive=None, review_harvester=None):
+    results, place_urls, failures, _, _ = harvest_search(driver, query, lat, lng, city=city, sleep_time=sleep_time, max_results=max_results, base_url=base_url, capture_xhr=capture_xhr, deadline=deadline, archive=archive)
+    results.extend(iter_visit_places(driver, place_urls, failures, sleep_time=sleep_time, max_attempts=max_attempts, tabs=tabs, deadline=deadline, archive=archive, review_harvester=review_harvester))
+    return results, failures
+
+# Function to scrape Google Maps over plain HTTP, reading the data embedded in the page instead of rendering it
+# Places the HTTP engine can't read are handed to Selenium; if the search page itself can't be read, the whole query is
+def scrape_google_maps_http(get_driver, query, lat, lng, city=None, sleep_time=5, max_results=50, max_attempts=3, tabs=1, base_url=http_engine.MAPS_BASE_URL, session=None, deadline=None, archive=None, review_harvester=None):
+    if session is None:
+        session = http_engine.make_session()
+    url = http_engine.maps_search_url(query, lat, lng, city=city, base_url=base_url)
+    
+    print(f"Fetching over HTTP: {url}")
+    try:
+        records = http_engine.http_search(session, url, max_results=max_results, base_url=base_url, archive=archive)
+    except Exception as e:
+        print(f"HTTP search failed: {str(e)}")
+        records = []
+    if not records:
+        print("HTTP engine found no embedded results; falling back to Selenium.")
+        return scrape_google_maps_urls(get_driver(), query, lat, lng, city=city, sleep_time=sleep_time, max_results=max_results, max_attempts=max_attempts, tabs=tabs, base_url=base_url, capture_xhr=True, deadline=deadline, archive=archive, review_harvester=review_harvester)
+    print(f"Found {len(records)} places in the embedded search data.")
+    
+    results = []
+    fallback_urls = []
+    failures = []
+    try:
+        for record in records:
+            # Search entries without an address are completed from the place page, still over HTTP
+            if record['address'] == 'N/A' and record['url'] and not (deadline and deadline.expired()):
+                try:
+                    detailed = http_engine.http_place(session, record['url'], base_url=base_url)
+                except Exception as e:
+                    print(f"HTTP place fetch failed: {str(e)}")
+                    detailed = None
+                if not detailed:
+                    fallback_urls.append(record['url'])
+                    continue
+                record = detailed
+            results.append(stamp_record(record))
+            print(f"Found: {record['name']} | Website: {record['website']}")
+    except KeyboardInterrupt:
+        # Every entry handled so far went to results or fallback_urls; complete entries need no fetch
+        remaining = records[len(results) + len(fallback_urls):]
+        results.extend(stamp_record(record) for record in remaining if record['address'] != 'N/A')
+        record_interrupted(failures, [(url, 1) for url in fallback_urls + [record['url'] for record in remaining if record['address'] == 'N/A' and record['url']]])
+        return results, failures
+    
+    if fallback_urls:
+        print(f"Falling back to Selenium for {len(fallback_urls)} places.")
+        browser_results, failures = visit_places(get_driver(), fallback_urls, sleep_time=sleep_time, max_attempts=max_attempts, tabs=tabs, deadline=deadline, archive=archive, review_harvester=review_harvester)
+        results.extend(browser_results)
+    return results, failures
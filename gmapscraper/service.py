@@ -0,0 +1,550 @@
+import argparse
+import itertools
+import json
+import signal
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from . import http_engine
+from .budget import Deadline, parse_duration
+from .cli import build_query
+from .record import peak_memory_mb
+
+# Long-running scrape service: a local HTTP job API in front of a pool of warm Scraper sessions.
+# Each worker thread owns one browser for the whole life of the service, geocodes and place pages are
+# cached across workers, and queued jobs are handed out round-robin per client so one client
+# submitting a batch can't starve the others.
+#
+#   POST /jobs                {"term": "cafe", "country": "Pakistan", "city": "Karachi", "num": 20}
+#   GET  /jobs                summaries of all known jobs
+#   GET  /jobs/<id>           status, queue position, counts, failures once finished
+#   GET  /jobs/<id>/results   results as NDJSON, streamed while the job runs (?offset=N to resume)
+#   DELETE /jobs/<id>         cancel a queued job
+#   GET  /health              pool size, busy workers, queued jobs
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+JOB_CANCELLED = 'cancelled'
+FINISHED_STATES = (JOB_DONE, JOB_FAILED, JOB_CANCELLED)
+
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 64 * 1024
+
+# Error raised for job submissions the service refuses; carries the HTTP status to answer with
+class JobRejected(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+# One submitted scrape; results are appended as the worker yields them so readers can stream them
+class Job:
+    def __init__(self, job_id, client, term, country, city=None, num=50, deadline=None):
+        self.id = job_id
+        self.client = client
+        self.term = term
+        self.country = country
+        self.city = city
+        self.num = num
+        self.deadline = deadline  # Seconds for the scrape itself (queue time not included), or None
+        self.query, self.location = build_query(term, country, city)
+        self.status = JOB_QUEUED
+        self.results = []
+        self.failures = []
+        self.outcome = None
+        self.error = None
+        self.worker = None
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self.changed = threading.Condition()
+
+    def add_result(self, record):
+        with self.changed:
+            self.results.append(record)
+            self.changed.notify_all()
+
+    def set_status(self, status, error=None):
+        with self.changed:
+            self.status = status
+            if status == JOB_RUNNING:
+                self.started = time.time()
+            elif status in FINISHED_STATES:
+                self.finished = time.time()
+            if error is not None:
+                self.error = error
+            self.changed.notify_all()
+
+    # Wait until there are results past offset or the job finished; returns (new results, finished)
+    def wait_for_results(self, offset, timeout=None):
+        with self.changed:
+            self.changed.wait_for(lambda: len(self.results) > offset or self.status in FINISHED_STATES, timeout)
+            return self.results[offset:], self.status in FINISHED_STATES
+
+    def summary(self, queue_position=None):
+        data = {
+            'id': self.id, 'client': self.client, 'status': self.status, 'query': self.query,
+            'term': self.term, 'country': self.country, 'city': self.city, 'num': self.num, 'deadline': self.deadline,
+            'results': len(self.results), 'failures': len(self.failures), 'outcome': self.outcome, 'error': self.error,
+            'worker': self.worker, 'submitted': self.submitted, 'started': self.started, 'finished': self.finished,
+        }
+        if queue_position is not None:
+            data['queue_position'] = queue_position
+        return data
+
+# Job queue with per-client round-robin: every get() takes the oldest job of the next client in turn
+class FairQueue:
+    def __init__(self, max_per_client=100):
+        self.max_per_client = max_per_client
+        self.pending = {}  # client -> deque of jobs
+        self.turns = deque()  # Clients with pending jobs, next to be served first
+        self.closed = False
+        self.lock = threading.Condition()
+
+    def put(self, job):
+        with self.lock:
+            if self.closed:
+                raise JobRejected("service is shutting down", status=503)
+            jobs = self.pending.get(job.client)
+            if jobs is None:
+                jobs = self.pending[job.client] = deque()
+                self.turns.append(job.client)
+            if len(jobs) >= self.max_per_client:
+                raise JobRejected(f"client {job.client!r} already has {len(jobs)} queued jobs", status=429)
+            jobs.append(job)
+            self.lock.notify()
+
+    # Next job in round-robin order; None once the queue is closed (or after timeout)
+    def get(self, timeout=None):
+        with self.lock:
+            if not self.lock.wait_for(lambda: self.turns or self.closed, timeout) or self.closed:
+                return None
+            client = self.turns.popleft()
+            jobs = self.pending[client]
+            job = jobs.popleft()
+            if jobs:
+                self.turns.append(client)  # Back of the line for its next job
+            else:
+                del self.pending[client]
+            return job
+
+    # Remove a job that hasn't started; returns False if it is no longer queued
+    def remove(self, job):
+        with self.lock:
+            jobs = self.pending.get(job.client)
+            if not jobs or job not in jobs:
+                return False
+            jobs.remove(job)
+            if not jobs:
+                del self.pending[job.client]
+                self.turns.remove(job.client)
+            return True
+
+    # Number of jobs that will be handed out before this one (None if it isn't queued)
+    def position(self, job):
+        with self.lock:
+            jobs = self.pending.get(job.client)
+            if not jobs or job not in jobs:
+                return None
+            index = jobs.index(job)
+            ahead = index
+            for turn, client in enumerate(self.turns):
+                if client == job.client:
+                    own_turn = turn
+                    break
+            for turn, client in enumerate(self.turns):
+                if client != job.client:
+                    # Clients served before this one in each round get one extra job in
+                    ahead += min(len(self.pending[client]), index + (1 if turn < own_turn else 0))
+            return ahead
+
+    def __len__(self):
+        with self.lock:
+            return sum(len(jobs) for jobs in self.pending.values())
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+            self.lock.notify_all()
+
+# Pool of worker threads, each owning one Scraper (one browser) that stays up between jobs
+class ScraperPool:
+    def __init__(self, queue, workers=2, warm=True, **scraper_options):
+        self.queue = queue
+        self.warm = warm  # Start each browser when the service starts instead of on the first job
+        self.scraper_options = scraper_options
+        self.geocode_cache = {}
+        self.place_cache = {}
+        self.busy = 0
+        self.scrapers = {}  # worker number -> its Scraper
+        self.deadlines = {}  # worker number -> budget.Deadline of the job it is running
+        self.stopping = threading.Event()
+        self.lock = threading.Lock()
+        self.threads = [threading.Thread(target=self._work, args=(number,), name=f"scraper-{number}", daemon=True)
+                        for number in range(workers)]
+
+    def start(self):
+        for thread in self.threads:
+            thread.start()
+
+    def _work(self, number):
+        from .session import Scraper
+        scraper = self.scrapers[number] = Scraper(geocode_cache=self.geocode_cache, place_cache=self.place_cache, **self.scraper_options)
+        try:
+            if self.warm and scraper.engine == 'selenium':
+                try:
+                    scraper.driver
+                except Exception as e:
+                    print(f"Worker {number}: browser failed to start ({str(e)}); retrying on the first job.")
+            while True:
+                job = self.queue.get()
+                if job is None:
+                    break
+                with self.lock:
+                    self.busy += 1
+                try:
+                    self._run(scraper, job, number)
+                finally:
+                    with self.lock:
+                        self.busy -= 1
+        finally:
+            scraper.close()
+
+    def _run(self, scraper, job, number):
+        job.worker = number
+        job.set_status(JOB_RUNNING)
+        print(f"Worker {number}: job {job.id} ({job.client}) '{job.query}' max_results={job.num}")
+        # Every job runs under a Deadline (unbounded without one) so stop() can end it between steps
+        deadline = Deadline(job.deadline or float('inf'), place_cost_guess=scraper.sleep_time + 3)
+        with self.lock:
+            self.deadlines[number] = deadline
+        if self.stopping.is_set():
+            deadline.stop()
+        try:
+            for record in scraper.iter_results(job.query, city=job.city, max_results=job.num, location=job.location,
+                                               deadline=deadline):
+                job.add_result(record)
+                if self.stopping.is_set():
+                    break
+            job.failures = list(scraper.last_failures)
+            job.outcome = scraper.last_outcome.value if scraper.last_outcome is not None else None
+            if self.stopping.is_set():
+                job.set_status(JOB_CANCELLED, error="service shut down")
+            else:
+                job.set_status(JOB_DONE)
+        except Exception as e:
+            job.failures = list(scraper.last_failures)
+            if self.stopping.is_set():  # Its browser was closed under it by close_stuck()
+                job.set_status(JOB_CANCELLED, error="service shut down")
+            else:
+                job.set_status(JOB_FAILED, error=f"{type(e).__name__}: {str(e)}")
+            print(f"Worker {number}: job {job.id} failed: {str(e)}. Restarting the browser.")
+            scraper.close()  # A broken browser is replaced lazily on the next job
+        finally:
+            with self.lock:
+                self.deadlines.pop(number, None)
+        print(f"Worker {number}: job {job.id} {job.status} with {len(job.results)} results, {len(job.failures)} failures.")
+
+    # Ask running jobs to stop at their next step (the results they have so far are kept)
+    def stop(self):
+        self.stopping.set()
+        with self.lock:
+            deadlines = list(self.deadlines.values())
+        for deadline in deadlines:
+            deadline.stop()
+
+    # Wait for the workers; timeout covers all of them together
+    def join(self, timeout=None):
+        ends = None if timeout is None else time.monotonic() + timeout
+        for thread in self.threads:
+            thread.join(None if ends is None else max(ends - time.monotonic(), 0))
+
+    # Quit the browsers of workers still stuck in a job (a hung page load), so no geckodriver/Firefox
+    # outlives the service; the worker's pending call then fails and it cleans up after itself
+    def close_stuck(self, grace=5):
+        stuck = [number for number, thread in enumerate(self.threads) if thread.is_alive() and number in self.scrapers]
+        for number in stuck:
+            print(f"Worker {number} did not stop in time; closing its browser.")
+            try:
+                self.scrapers[number].close()
+            except Exception as e:
+                print(f"Worker {number}: closing the browser failed: {str(e)}")
+        if stuck:
+            self.join(grace)
+
+# The job registry tying the queue, the pool and the HTTP handler together
+class ScrapeService:
+    def __init__(self, workers=2, max_queued_per_client=100, max_finished_jobs=1000, warm=True, **scraper_options):
+        # One PageArchive (thread-safe) for every worker: connections of their own would contend for the
+        # SQLite write lock and each train its own zstd dictionary
+        self.archive = None
+        if isinstance(scraper_options.get('archive'), str):
+            from .archive import PageArchive
+            self.archive = scraper_options['archive'] = PageArchive(scraper_options['archive'])
+        self.queue = FairQueue(max_per_client=max_queued_per_client)
+        self.pool = ScraperPool(self.queue, workers=workers, warm=warm, **scraper_options)
+        self.max_finished_jobs = max_finished_jobs  # Older finished jobs (and their results) are forgotten
+        self.jobs = {}  # job id -> Job, in submission order
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+
+    def start(self):
+        self.pool.start()
+
+    def submit(self, client, params):
+        term = params.get('term')
+        country = params.get('country')
+        if not isinstance(term, str) or not term.strip():
+            raise JobRejected("'term' is required")
+        if not isinstance(country, str) or not country.strip():
+            raise JobRejected("'country' is required")
+        city = params.get('city') or None
+        if city is not None and not isinstance(city, str):
+            raise JobRejected("'city' must be a string")
+        num = params.get('num', 50)
+        if not isinstance(num, int) or isinstance(num, bool) or num < 1:
+            raise JobRejected("'num' must be a positive integer")
+        deadline = params.get('deadline')
+        if deadline is not None:
+            try:
+                deadline = parse_duration(deadline)
+            except ValueError as e:
+                raise JobRejected(f"'deadline': {str(e)}") from None
+            if deadline <= 0:
+                raise JobRejected("'deadline' must be positive")
+        with self.lock:
+            job = Job(f"{next(self.ids)}-{int(time.time())}", client, term.strip(), country.strip(), city, num, deadline)
+            self.queue.put(job)
+            self.jobs[job.id] = job
+            self._forget_old_jobs()
+        return job
+
+    def _forget_old_jobs(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.status in FINISHED_STATES]
+        for job_id in finished[:max(len(finished) - self.max_finished_jobs, 0)]:
+            del self.jobs[job_id]
+
+    def get(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def cancel(self, job):
+        if not self.queue.remove(job):
+            return False
+        job.set_status(JOB_CANCELLED)
+        return True
+
+    def summary(self, job):
+        return job.summary(queue_position=self.queue.position(job) if job.status == JOB_QUEUED else None)
+
+    def health(self):
+        with self.lock:
+            jobs = list(self.jobs.values())
+        return {
+            'workers': len(self.pool.threads), 'busy': self.pool.busy, 'queued': len(self.queue),
+            'jobs': len(jobs), 'cached_places': len(self.pool.place_cache), 'cached_locations': len(self.pool.geocode_cache),
+            'peak_memory_mb': round(peak_memory_mb() or 0, 1),
+        }
+
+    def list_jobs(self):
+        with self.lock:
+            jobs = list(self.jobs.values())
+        return [self.summary(job) for job in jobs]
+
+    # Stop taking jobs, cancel the queued ones, stop running jobs at their next step and give them up to
+    # timeout seconds to wind down; browsers of jobs still stuck after that are closed from here
+    def close(self, timeout=30):
+        self.queue.close()
+        with self.lock:
+            queued = [job for job in self.jobs.values() if job.status == JOB_QUEUED]
+        for job in queued:
+            job.set_status(JOB_CANCELLED, error="service shut down")
+        self.pool.stop()
+        self.pool.join(timeout)
+        self.pool.close_stuck()
+        if self.archive is not None:
+            self.archive.close()
+
+# HTTP front end; the ScrapeService is reached through self.server.service
+class ServiceHandler(BaseHTTPRequestHandler):
+    server_version = "gmapscraper"
+
+    def _send_json(self, status, data):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status, message):
+        self._send_json(status, {'error': message})
+
+    # Requests are told apart per client for fairness: an explicit X-Client-Id header, else the peer address
+    def _client(self, params=None):
+        return (params or {}).get('client') or self.headers.get('X-Client-Id') or self.client_address[0]
+
+    def _route(self):
+        parts = [part for part in urlsplit(self.path).path.split('/') if part]
+        query = parse_qs(urlsplit(self.path).query)
+        return parts, query
+
+    def _job(self, job_id):
+        job = self.server.service.get(job_id)
+        if job is None:
+            self._error(404, f"no such job: {job_id}")
+        return job
+
+    def do_GET(self):
+        parts, query = self._route()
+        service = self.server.service
+        if parts == ['health']:
+            self._send_json(200, service.health())
+        elif parts == ['jobs']:
+            self._send_json(200, service.list_jobs())
+        elif len(parts) == 2 and parts[0] == 'jobs':
+            job = self._job(parts[1])
+            if job is not None:
+                data = service.summary(job)
+                if job.status in FINISHED_STATES:
+                    data['failure_report'] = job.failures
+                self._send_json(200, data)
+        elif len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'results':
+            job = self._job(parts[1])
+            if job is not None:
+                try:
+                    offset = int(query.get('offset', ['0'])[0])
+                except ValueError:
+                    return self._error(400, "'offset' must be an integer")
+                self._stream_results(job, max(offset, 0), follow=query.get('follow', ['1'])[0] != '0')
+        else:
+            self._error(404, "not found")
+
+    # NDJSON, one record per line, flushed as the worker produces them; the response ends when the job
+    # finishes (or straight away with follow=0)
+    def _stream_results(self, job, offset, follow=True):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson; charset=utf-8')
+        self.send_header('X-Job-Status', job.status)
+        self.end_headers()
+        try:
+            while True:
+                records, finished = job.wait_for_results(offset, timeout=15 if follow else 0)
+                for record in records:
+                    self.wfile.write(json.dumps(dict(record), ensure_ascii=False).encode('utf-8') + b'\n')
+                offset += len(records)
+                self.wfile.flush()
+                if finished or not follow:
+                    break
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Client went away; it can resume with ?offset=
+
+    def do_POST(self):
+        parts, _ = self._route()
+        if parts != ['jobs']:
+            return self._error(404, "not found")
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_BODY_BYTES:
+            return self._error(413, "request body too large")
+        try:
+            params = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            return self._error(400, "body must be JSON")
+        if not isinstance(params, dict):
+            return self._error(400, "body must be a JSON object")
+        try:
+            job = self.server.service.submit(str(self._client(params)), params)
+        except JobRejected as e:
+            return self._error(e.status, str(e))
+        data = self.server.service.summary(job)
+        data['links'] = {'status': f"/jobs/{job.id}", 'results': f"/jobs/{job.id}/results"}
+        self._send_json(202, data)
+
+    def do_DELETE(self):
+        parts, _ = self._route()
+        if len(parts) != 2 or parts[0] != 'jobs':
+            return self._error(404, "not found")
+        job = self._job(parts[1])
+        if job is None:
+            return
+        if not self.server.service.cancel(job):
+            return self._error(409, f"job {job.id} is {job.status}; only queued jobs can be cancelled")
+        self._send_json(200, self.server.service.summary(job))
+
+    def log_message(self, format, *args):
+        print(f"{self.address_string()} {format % args}")
+
+# Function to create the HTTP server for a service (not started)
+def make_server(service, host='127.0.0.1', port=DEFAULT_PORT):
+    server = ThreadingHTTPServer((host, port), ServiceHandler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+# Function to build the service's command-line parser
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="gmapscraper-serve",
+        description="Run the scraper as a long-lived local HTTP service with a pool of warm browsers.",
+        epilog="Examples:\n"
+               "  gmapscraper-serve --workers 3\n"
+               "  curl -s -XPOST localhost:8765/jobs -d '{\"term\": \"cafe\", \"country\": \"Pakistan\", \"city\": \"Karachi\", \"num\": 20}'\n"
+               "  curl -sN localhost:8765/jobs/1-1700000000/results",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on. Default: 127.0.0.1 (local only)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port to listen on. Default: {DEFAULT_PORT}")
+    parser.add_argument("--workers", type=int, default=2, help="Browser sessions in the pool (jobs run in parallel up to this). Default: 2")
+    parser.add_argument("--max-queued", type=int, default=100, help="Queued jobs allowed per client before submissions get 429. Default: 100")
+    parser.add_argument("--no-warm", action="store_true", help="Start each browser on its first job instead of at service startup.")
+    parser.add_argument("-t", "--sleep", type=int, default=5, help="Sleep delay in seconds for loading. Default: 5")
+    parser.add_argument("--tabs", type=int, default=1, help="Tabs per browser for place pages. Default: 1")
+    parser.add_argument("--engine", choices=["selenium", "http"], default="selenium", help="Scrape engine for every job. Default: selenium")
+    parser.add_argument("--base-url", default=http_engine.MAPS_BASE_URL, help=f"Maps host to query. Default: {http_engine.MAPS_BASE_URL}")
+    parser.add_argument("--capture-xhr", action="store_true", help="Decode the feed's own search responses while scrolling (selenium engine).")
+    parser.add_argument("--retries", type=int, default=2, help="Extra attempts per failed place. Default: 2")
+    parser.add_argument("--profile-dir", default=None, help="Persistent Firefox profile; workers beyond the first get a copy. Default: fresh temporary profiles")
+    parser.add_argument("--cache-size", type=int, default=256, help="Disk cache limit in MB for --profile-dir. Default: 256")
+    parser.add_argument("--archive", default=None, help="Keep the raw pages of every job in this compressed SQLite archive.")
+    parser.add_argument("--no-harden", action="store_true", help="Keep Firefox's background services enabled.")
+    parser.add_argument("--geckodriver", default=None, help="Path to geckodriver if it is not in PATH.")
+    return parser
+
+# Service entry point: serve until Ctrl+C or SIGTERM, then stop running jobs after their current step
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.tabs < 1:
+        parser.error("--tabs must be at least 1")
+    if args.retries < 0:
+        parser.error("--retries can't be negative")
+    if args.max_queued < 1:
+        parser.error("--max-queued must be at least 1")
+
+    service = ScrapeService(workers=args.workers, max_queued_per_client=args.max_queued, warm=not args.no_warm,
+                            engine=args.engine, sleep_time=args.sleep, tabs=args.tabs, max_attempts=args.retries + 1,
+                            capture_xhr=args.capture_xhr, base_url=args.base_url, geckodriver_path=args.geckodriver,
+                            profile_dir=args.profile_dir, cache_size_mb=args.cache_size, harden=not args.no_harden,
+                            archive=args.archive)
+    server = make_server(service, args.host, args.port)
+    # SIGTERM stops serve_forever from another thread (it can't be called from the serving thread)
+    signal.signal(signal.SIGTERM, lambda signum, frame: threading.Thread(target=server.shutdown).start())
+    service.start()
+    print(f"Serving on http://{args.host}:{server.server_address[1]} with {args.workers} workers ({args.engine} engine)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print("Shutting down: waiting for running jobs...")
+        service.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+import copy
+
+from . import http_engine
+from .browser import build_firefox_options, create_driver
+from . import profile
+from .budget import Deadline
+from .geocode import get_location_coordinates
+from .record import PlaceRecord
+from .refresh import diff_results, fresh_records
+from .scraper import harvest_search, iter_places, iter_visit_places, scrape_google_maps_http, stamp_record
+
+# Reusable scraping session. It owns one browser (started on first use), its options and its caches,
+# so a long-running process pays Firefox startup once instead of once per query:
+#
+#     with Scraper(tabs=4) as scraper:
+#         results, failures = scraper.search("cafes in Karachi, Pakistan", city="Karachi")
+#         for record in scraper.iter_results("hotels in Lahore, Pakistan", max_results=100):
+#             ...
+class Scraper:
+    def __init__(self, engine='selenium', sleep_time=5, tabs=1, max_attempts=3, capture_xhr=False,
+                 base_url=http_engine.MAPS_BASE_URL, firefox_options=None, geckodriver_path=None, max_cached_places=10000,
+                 profile_dir=None, cache_size_mb=256, cache_max_age_days=14, harden=True, geocode_cache=None, place_cache=None,
+                 archive=None, review_harvester=None):
+        if engine not in ('selenium', 'http'):
+            raise ValueError(f"Unknown engine: {engine!r} (expected 'selenium' or 'http')")
+        if tabs < 1:
+            raise ValueError("tabs must be at least 1")
+        self.engine = engine
+        self.sleep_time = sleep_time
+        self.tabs = tabs
+        self.max_attempts = max_attempts
+        self.capture_xhr = capture_xhr
+        self.base_url = base_url.rstrip('/')
+        self.firefox_options = firefox_options  # None means build_firefox_options() defaults
+        self.geckodriver_path = geckodriver_path
+        self.harden = harden  # Apply HARDENED_PREFS when building the default options
+        self.profile_dir = profile_dir  # Persistent profile with a warm HTTP cache (None = fresh temporary profile)
+        self.cache_size_mb = cache_size_mb
+        self.cache_max_age_days = cache_max_age_days
+        self.max_cached_places = max_cached_places
+        # Pass the same dicts to several Scrapers (e.g. a service's browser pool) to share the caches
+        self.geocode_cache = {} if geocode_cache is None else geocode_cache  # location -> (lat, lng)
+        self.place_cache = {} if place_cache is None else place_cache  # feature ID (or URL) -> record, oldest first
+        self.last_failures = []  # Failure report of the most recent search/iter_results/place call
+        self.last_outcome = None  # SearchOutcome of the most recent search page (selenium engine)
+        self.last_complete = False  # Whether the most recent search listed every place of its query
+        self.last_search_failed = False  # Whether the most recent search page itself failed (blocked, timed out)
+        self.archive_path = archive if isinstance(archive, str) else None  # Raw-page archive file, opened on first use
+        self._archive = None if isinstance(archive, str) else archive  # ...or an open archive.PageArchive
+        self.review_harvester = review_harvester  # reviews.ReviewHarvester fed by every visited place page (None = no reviews)
+        self._driver = None
+        self._session = None
+        self._profile = None
+
+    # The browser is started the first time something needs it
+    @property
+    def driver(self):
+        if self._driver is None:
+            firefox_options = self.firefox_options or build_firefox_options(harden=self.harden)
+            if self.profile_dir:
+                if firefox_options is self.firefox_options:
+                    firefox_options = copy.deepcopy(firefox_options)  # A restart would add a second -profile to the caller's options
+                self._profile = profile.open_profile(self.profile_dir, max_age_days=self.cache_max_age_days)
+                profile.apply_profile(firefox_options, self._profile.path, cache_size_mb=self.cache_size_mb)
+            try:
+                self._driver = create_driver(firefox_options, geckodriver_path=self.geckodriver_path)
+            except Exception:
+                self._release_profile()
+                raise
+        return self._driver
+
+    def _release_profile(self):
+        if self._profile is not None:
+            self._profile.release()
+            self._profile = None
+
+    # Pooled HTTP session for the http engine, shared across queries
+    @property
+    def session(self):
+        if self._session is None:
+            self._session = http_engine.make_session()
+        return self._session
+
+    # Archive of the raw pages (None unless an archive was given)
+    @property
+    def archive(self):
+        if self._archive is None and self.archive_path:
+            from .archive import PageArchive
+            self._archive = PageArchive(self.archive_path)
+        return self._archive
+
+    # Close the browser and the HTTP session; the Scraper can be used again afterwards (it restarts lazily)
+    def close(self):
+        if self._driver is not None:
+            try:
+                self._driver.quit()  # Close the browser
+            finally:
+                self._driver = None
+                self._release_profile()
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+        if self._archive is not None and self.archive_path:
+            self._archive.close()  # Only an archive this Scraper opened itself
+            self._archive = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    # Geocode a location once per session
+    def geocode(self, location):
+        if location not in self.geocode_cache:
+            self.geocode_cache[location] = get_location_coordinates(location)
+        return self.geocode_cache[location]
+
+    # Place cache key: the feature ID is stable across queries, the href is not
+    def _cache_key(self, place_url):
+        return http_engine.feature_id_from_url(place_url) or place_url
+
+    def _remember(self, record):
+        if record.get('url'):
+            self.place_cache[self._cache_key(record['url'])] = record
+            if len(self.place_cache) > self.max_cached_places:
+                try:
+                    del self.place_cache[next(iter(self.place_cache))]  # Drop the oldest entry
+                except (KeyError, RuntimeError, StopIteration):
+                    pass  # Another Scraper sharing the cache evicted (or inserted) at the same moment
+
+    # Generator that yields records as they are scraped; places already in the cache are not visited again
+    # Without lat/lng the location (or the query itself) is geocoded
+    # deadline (seconds or a budget.Deadline) bounds the wall-clock time; unvisited places go to last_failures
+    # known maps place IDs to records (e.g. a previous run's) that are reused instead of visiting the place
+    def iter_results(self, query, lat=None, lng=None, city=None, max_results=50, location=None, deadline=None, known=None):
+        if deadline is not None and not isinstance(deadline, Deadline):
+            deadline = Deadline(deadline, place_cost_guess=self.sleep_time + 3)
+        if lat is None or lng is None:
+            lat, lng = self.geocode(location or query)
+        self.last_failures = failures = []
+        self.last_outcome = None
+        self.last_complete = False  # The HTTP engine only reads the feed's first page
+        search_url = http_engine.maps_search_url(query, lat, lng, city=city, base_url=self.base_url)
+        
+        if self.engine == 'http':
+            results, http_failures = scrape_google_maps_http(lambda: self.driver, query, lat, lng, city=city, sleep_time=self.sleep_time, max_results=max_results, max_attempts=self.max_attempts, tabs=self.tabs, base_url=self.base_url, session=self.session, deadline=deadline, archive=self.archive, review_harvester=self.review_harvester)
+            failures.extend(http_failures)
+            self.last_search_failed = any(failure['url'] == search_url for failure in failures)
+            for record in results:
+                self._remember(record)
+                yield record
+            return
+        
+        records, place_urls, search_failures, self.last_outcome, self.last_complete = harvest_search(self.driver, query, lat, lng, city=city, sleep_time=self.sleep_time, max_results=max_results, base_url=self.base_url, capture_xhr=self.capture_xhr, deadline=deadline, archive=self.archive)
+        failures.extend(search_failures)
+        self.last_search_failed = any(failure['url'] == search_url for failure in failures)
+        for record in records:
+            self._remember(record)
+            yield record
+        
+        to_visit = []
+        reused = 0
+        for place_url in place_urls:
+            cached = self.place_cache.get(self._cache_key(place_url))
+            previous = known.get(http_engine.feature_id_from_url(place_url)) if known else None
+            if cached:
+                yield cached
+            elif previous:
+                reused += 1
+                yield PlaceRecord(previous, url=place_url)
+            else:
+                to_visit.append(place_url)
+        if len(to_visit) + reused < len(place_urls):
+            print(f"{len(place_urls) - len(to_visit) - reused} places came from the session cache.")
+        if reused:
+            print(f"{reused} places were recent enough to reuse without a visit.")
+        
+        for record in iter_visit_places(self.driver, to_visit, failures, sleep_time=self.sleep_time, max_attempts=self.max_attempts, tabs=self.tabs, deadline=deadline, archive=self.archive, review_harvester=self.review_harvester):
+            self._remember(record)
+            yield record
+
+    # Collect a query's records; an interrupt (Ctrl+C/SIGTERM) that escapes the scrape still keeps what it yielded
+    def _collect(self, records):
+        results = []
+        try:
+            for record in records:
+                results.append(record)
+        except KeyboardInterrupt:
+            self.last_complete = False  # Places after the interrupt were never reported
+            if not results:
+                raise  # Nothing to save: stop as before
+            print("Interrupted; saving results gathered so far.")
+        return results
+
+    # Run a query and return (results, failures)
+    def search(self, query, lat=None, lng=None, city=None, max_results=50, location=None, deadline=None):
+        results = self._collect(self.iter_results(query, lat=lat, lng=lng, city=city, max_results=max_results, location=location, deadline=deadline))
+        return results, self.last_failures
+
+    # Re-run a query against a previous run's records (refresh.load_previous): places scraped less than
+    # stale_after seconds ago are reused instead of visited; returns (results, changes), the changes being
+    # the added/removed/modified log of refresh.diff_results (places only count as removed if the search was complete)
+    def refresh(self, query, previous, stale_after=7 * 86400, lat=None, lng=None, city=None, max_results=50, location=None, deadline=None):
+        known = fresh_records(previous, stale_after)
+        print(f"Refreshing against {len(previous)} previous places ({len(known)} recent enough to reuse).")
+        results = self._collect(self.iter_results(query, lat=lat, lng=lng, city=city, max_results=max_results, location=location, deadline=deadline, known=known))
+        return diff_results(previous, results, self.last_failures, complete=self.last_complete)
+
+    # Scrape one place page (from the cache unless refresh=True); returns None if it still failed after retries
+    def place(self, place_url, refresh=False):
+        key = self._cache_key(place_url)
+        if not refresh and key in self.place_cache:
+            return self.place_cache[key]
+        self.last_failures = failures = []
+        
+        record = None
+        if self.engine == 'http':
+            try:
+                record = http_engine.http_place(self.session, place_url, base_url=self.base_url)
+                if record is not None:
+                    record = stamp_record(record)
+            except Exception as e:
+                print(f"HTTP place fetch failed: {str(e)}")
+        if record is None:
+            records = list(iter_places(self.driver, [place_url], failures, sleep_time=self.sleep_time, max_attempts=self.max_attempts, archive=self.archive, review_harvester=self.review_harvester))
+            record = records[0] if records else None
+        if record is not None:
+            self._remember(record)
+        return record
@@ -1,131 +0,0 @@
-import time
-import csv
-import sys  # Added for command-line args
-from selenium import webdriver
-from selenium.webdriver.firefox.options import Options  # Use Firefox options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
-
-# Configure Selenium with headless Firefox
-firefox_options = Options()
-firefox_options.add_argument("--headless")  # Headless mode
-firefox_options.add_argument("--no-sandbox")  # Required in Termux
-firefox_options.add_argument("--disable-dev-shm-usage")  # Overcome limited /dev/shm in Android
-firefox_options.add_argument("--disable-gpu")  # Disable GPU (helps on ARM)
-firefox_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/115.0")
-
-# Initialize WebDriver (GeckoDriver should be in PATH)
-driver = webdriver.Firefox(options=firefox_options)
-# If GeckoDriver not found, uncomment and set path: 
-# driver = webdriver.Firefox(options=firefox_options, executable_path="/data/data/com.termux/files/usr/bin/geckodriver")
-
-# Output file
-output_file = 'pakistan_urls_scraped.csv'
-
-# Function to scrape Google Maps
-def scrape_google_maps_urls(query, max_results=50):
-    results = []
-    url = f"https://www.google.com/maps/search/{query.replace(' ', '+')}/@30.3753,69.3451,6z"
-    
-    print(f"Navigating to: {url}")
-    driver.get(url)
-    
-    try:
-        # Wait for search results to load (increased timeout for slower ARM devices)
-        WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located((By.CLASS_NAME, "hfpxzc"))  # Place result links
-        )
-        
-        # Scroll to load more results
-        last_height = driver.execute_script("return document.body.scrollHeight")
-        scroll_attempts = 0
-        max_scrolls = 5  # Adjust based on how many results you want
-        
-        while scroll_attempts < max_scrolls:
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(3)  # Increased delay for loading on mobile/ARM
-            new_height = driver.execute_script("return document.body.scrollHeight")
-            if new_height == last_height:
-                break
-            last_height = new_height
-            scroll_attempts += 1
-        
-        # Parse page source with BeautifulSoup
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-        place_elements = soup.find_all('a', class_='hfpxzc')  # Links to place details
-        
-        print(f"Found {len(place_elements)} place elements.")
-        
-        for i, place in enumerate(place_elements[:max_results]):
-            place_url = place.get('href')
-            if not place_url:
-                continue
-                
-            print(f"Processing place {i+1}/{min(max_results, len(place_elements))}...")
-            driver.get(place_url)
-            time.sleep(3)  # Increased delay for place details to load on slower connections
-            
-            # Parse place details page
-            place_soup = BeautifulSoup(driver.page_source, 'html.parser')
-            
-            # Extract place name
-            name_elem = place_soup.find('h1', class_='DUwDvf')
-            name = name_elem.text.strip() if name_elem else 'N/A'
-            
-            # Extract website URL (updated selector for reliability; may need tweaks if Google changes)
-            website_elem = place_soup.find('a', {'data-item-id': lambda x: x and 'authority' in x})
-            website = website_elem.get('href') if website_elem else 'No website available'
-            
-            # Extract address
-            address_elem = place_soup.find('div', class_='Io6YTe')
-            address = address_elem.text.strip() if address_elem else 'N/A'
-            
-            results.append({
-                'name': name,
-                'website': website,
-                'address': address
-            })
-            print(f"Found: {name} | Website: {website}")
-            
-    except Exception as e:
-        print(f"Error during scraping: {str(e)}")
-    
-    return results
-
-# Save results to CSV
-def save_to_csv(results, filename):
-    with open(filename, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=['name', 'website', 'address'])
-        writer.writeheader()
-        for result in results:
-            writer.writerow(result)
-    print(f"Results saved to {filename}")
-
-# Main execution with command-line args
-if __name__ == "__main__":
-    # Default values
-    search_term = "business"
-    max_results = 50
-    
-    # Parse command-line arguments
-    if len(sys.argv) > 1:
-        search_term = sys.argv[1]
-    if len(sys.argv) > 2:
-        try:
-            max_results = int(sys.argv[2])
-        except ValueError:
-            print("Invalid number for max_results. Using default 50.")
-            max_results = 50
-    
-    # Construct query (pluralize if needed and add " in Pakistan")
-    query = f"{search_term}s in Pakistan" if not search_term.endswith('s') else f"{search_term} in Pakistan"
-    print(f"Using query: '{query}' with max_results: {max_results}")
-    
-    try:
-        results = scrape_google_maps_urls(query, max_results=max_results)
-        save_to_csv(results, output_file)
-        print(f"Scraping complete. Found {len(results)} places with URLs.")
-    finally:
-        driver.quit()  # Close the browser
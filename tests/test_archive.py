@@ -0,0 +1,67 @@
+import os
+import time
+
+import pytest
+
+from gmapscraper import archive, http_engine
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+KOLACHI_ID = '0x3eb33e1e6c1fe8a3:0x2a1a0b2c58f0e0c1'
+CODECS = ['zlib', pytest.param('zstd', marks=pytest.mark.skipif(archive.load_zstd() is None, reason="zstandard not installed"))]
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as f:
+        return f.read()
+
+# Function to make n distinct place pages sharing the saved page's markup
+def place_pages(n):
+    html = read_fixture('place.html')
+    return {http_engine.maps_place_url(f"0x{number:x}:0x{number:x}"): html.replace('Kolachi Restaurant', f"Place {number}") for number in range(1, n + 1)}
+
+@pytest.mark.parametrize('codec', CODECS)
+def test_pages_round_trip(tmp_path, codec):
+    pages = place_pages(3)
+    with archive.PageArchive(str(tmp_path / 'pages.sqlite'), codec=codec) as page_archive:
+        for url, html in pages.items():
+            assert page_archive.store(archive.KIND_PLACE, url, html)
+        rows = page_archive.pages(archive.KIND_PLACE)
+        assert sorted(key for key, _, _, _ in rows) == sorted(http_engine.feature_id_from_url(url) for url in pages)
+        assert {url: page_archive.load(digest) for _, _, url, digest in rows} == pages
+
+def test_one_page_per_key_and_day_and_one_blob_per_content(tmp_path):
+    html = read_fixture('place.html')
+    kolachi = http_engine.maps_place_url(KOLACHI_ID)
+    with archive.PageArchive(str(tmp_path / 'pages.sqlite'), codec='zlib') as page_archive:
+        assert page_archive.store(archive.KIND_PLACE, kolachi, html)
+        assert not page_archive.store(archive.KIND_PLACE, kolachi + '&authuser=0', html.replace('4.5', '4.6'))  # Same place, same day
+        assert page_archive.store(archive.KIND_SEARCH, 'https://www.google.com/maps/search/kolachi', html)
+        stats = page_archive.stats()
+        assert stats['pages'] == {archive.KIND_PLACE: 1, archive.KIND_SEARCH: 1}
+        assert stats['blobs'] == 1
+        assert page_archive.pages(archive.KIND_PLACE)[0][1] == time.strftime('%Y-%m-%d', time.gmtime())
+
+@pytest.mark.parametrize('codec', CODECS)
+def test_dictionary_is_trained_and_earlier_pages_still_load(tmp_path, codec):
+    pages = place_pages(12)  # Trained after 8 (zstd needs a few samples); the last 4 are compressed with the dictionary
+    path = str(tmp_path / 'pages.sqlite')
+    with archive.PageArchive(path, codec=codec, train_after=8) as page_archive:
+        for url, html in pages.items():
+            page_archive.store(archive.KIND_PLACE, url, html)
+        assert page_archive.dict_id is not None
+        assert page_archive.stats()['dictionaries'] == 1
+        assert page_archive.db.execute("SELECT COUNT(*) FROM blobs WHERE dict_id IS NOT NULL").fetchone()[0] == 4
+    with archive.PageArchive(path, readonly=True, codec=codec) as page_archive:
+        assert page_archive.dict_id is not None  # A reopened archive keeps compressing with it
+        assert {url: page_archive.load(digest) for _, _, url, digest in page_archive.pages()} == pages
+
+def test_reextract_runs_the_extraction_spec_over_archived_pages(tmp_path):
+    path = str(tmp_path / 'pages.sqlite')
+    kolachi = http_engine.maps_place_url(KOLACHI_ID)
+    broken = http_engine.maps_place_url('0x1:0x1')
+    with archive.PageArchive(path, codec='zlib') as page_archive:
+        page_archive.store(archive.KIND_PLACE, kolachi, read_fixture('place.html'))
+        page_archive.store(archive.KIND_PLACE, broken, '<html><body>Before you continue</body></html>')
+    records, failures = archive.reextract(path, workers=1)
+    assert [(record['name'], record['phone'], record['place_id']) for record in records] == [('Kolachi Restaurant', '02135347981', KOLACHI_ID)]
+    assert records[0]['scraped_at'] == time.strftime('%Y-%m-%d', time.gmtime())  # The day the page was archived
+    assert [failure['url'] for failure in failures] == [broken]
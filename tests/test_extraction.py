@@ -0,0 +1,38 @@
+import os
+
+from bs4 import BeautifulSoup
+
+from gmapscraper import extraction
+from gmapscraper.scraper import parse_place_page
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+# Function to read a saved page from the fixtures directory
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as f:
+        return f.read()
+
+def test_extract_place_reads_every_field_of_a_saved_place_page():
+    soup = BeautifulSoup(read_fixture('place.html'), 'html.parser')
+    assert extraction.extract_place(soup) == {
+        'name': 'Kolachi Restaurant',
+        'website': 'https://kolachi.com.pk/',
+        'address': 'Abdul Sattar Edhi Ave, D.H.A. Phase 8, Karachi, Sindh 75500, Pakistan',
+        'phone': '02135347981',
+        'rating': 4.5,
+        'reviews': 21874,
+        'category': 'Barbecue restaurant',
+    }
+
+# Tags without tag-specific rules (<html>, <div>, ...) only get the any-tag rules
+def test_extract_place_handles_tags_without_rules():
+    soup = BeautifulSoup('<html><body><div><h1 class="DUwDvf">X</h1></div></body></html>', 'html.parser')
+    record = extraction.extract_place(soup)
+    assert record['name'] == 'X'
+    assert record['website'] == 'No website available'
+    assert record['address'] == 'N/A'
+
+def test_parse_place_page_matches_extract_place():
+    record = parse_place_page(read_fixture('place.html'))
+    assert record['name'] == 'Kolachi Restaurant'
+    assert record['reviews'] == 21874
@@ -0,0 +1,64 @@
+import pytest
+
+from gmapscraper import geo
+
+KOLACHI_URL = 'https://www.google.com/maps/place/Kolachi/data=!4m7!3m6!1s0x3eb33e1e6c1fe8a3:0x2a1a0b2c58f0e0c1!8m2!3d24.7926!4d67.0512!16s%2Fg%2F1tdvlbsq'
+
+def place(name, lat, lng):
+    return {'name': name, 'lat': lat, 'lng': lng}
+
+# Function to index a few Karachi places: two ~50 m apart, one ~1 km away, and one in London (negative longitude)
+def karachi_index(cell_size_m=500):
+    index = geo.SpatialIndex(cell_size_m=cell_size_m)
+    for record in (place('Kolachi', 24.7926, 67.0512), place('Cafe Flo', 24.7930, 67.0510),
+                   place('Okra', 24.8016, 67.0512), place('Dishoom', 51.5128, -0.1269)):
+        index.insert(record)
+    return index
+
+def test_coordinates_from_url():
+    assert geo.coordinates_from_url(KOLACHI_URL) == (24.7926, 67.0512)
+    assert geo.coordinates_from_url('https://www.google.com/maps/place/x/data=!3d-33.8688!4d151.2093') == (-33.8688, 151.2093)
+    assert geo.coordinates_from_url('https://www.google.com/maps/place/data=!4m2!3m1!1s0x1:0x2') == (None, None)
+    assert geo.coordinates_from_url(None) == (None, None)
+
+def test_haversine_m():
+    assert geo.haversine_m(24.7926, 67.0512, 24.7926, 67.0512) == 0
+    assert geo.haversine_m(24.7926, 67.0512, 24.8016, 67.0512) == pytest.approx(1000, rel=0.01)
+
+@pytest.mark.parametrize('cell_size_m', [50, 500, 5000])
+def test_query_radius_is_nearest_first_and_exact(cell_size_m):
+    index = karachi_index(cell_size_m)
+    assert [record['name'] for record in index.query_radius(24.7926, 67.0512, 100)] == ['Kolachi', 'Cafe Flo']
+    assert [record['name'] for record in index.query_radius(24.7930, 67.0510, 2000)] == ['Cafe Flo', 'Kolachi', 'Okra']
+    assert index.query_radius(0, 0, 1000) == []
+
+def test_query_bbox_spans_cells_and_negative_coordinates():
+    index = karachi_index(cell_size_m=100)
+    assert sorted(record['name'] for record in index.query_bbox(24.79, 67.05, 24.80, 67.06)) == ['Cafe Flo', 'Kolachi']
+    assert [record['name'] for record in index.query_bbox(51.5, -0.2, 51.6, 0.1)] == ['Dishoom']
+
+def test_add_unique_drops_the_same_name_nearby_only():
+    index = geo.SpatialIndex()
+    kept = index.add_unique([
+        place('Kolachi Restaurant', 24.7926, 67.0512),
+        place('kolachi restaurant!', 24.7927, 67.0512),  # ~11 m away, same normalized name
+        place('Kolachi Restaurant', 24.8016, 67.0512),  # Same name ~1 km away: another branch
+        place('Cafe Flo', 24.7926, 67.0512),
+        {'name': 'No coordinates', 'lat': None, 'lng': None},
+    ])
+    assert [(record['name'], record['lat']) for record in kept] == [
+        ('Kolachi Restaurant', 24.7926), ('Kolachi Restaurant', 24.8016), ('Cafe Flo', 24.7926), ('No coordinates', None)]
+    assert len(index) == 3  # The place without coordinates is kept but can't be indexed
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / 'index.json')
+    index = karachi_index(cell_size_m=250)
+    index.save(path)
+    loaded = geo.SpatialIndex.load(path)
+    assert loaded.cell_size_m == 250 and len(loaded) == len(index)
+    assert [record['name'] for record in loaded.query_radius(24.7926, 67.0512, 100)] == ['Kolachi', 'Cafe Flo']
+    assert list(tmp_path.iterdir()) == [tmp_path / 'index.json']  # No temporary file left behind
+
+def test_add_coordinates_keeps_existing_values():
+    assert geo.add_coordinates({'url': KOLACHI_URL})['lat'] == 24.7926
+    assert geo.add_coordinates({'lat': 1.0, 'lng': 2.0}, KOLACHI_URL) == {'lat': 1.0, 'lng': 2.0}
@@ -0,0 +1,77 @@
+import http.server
+import os
+import threading
+
+import pytest
+
+from gmapscraper import http_engine
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+KOLACHI_ID = '0x3eb33e1e6c1fe8a3:0x2a1a0b2c58f0e0c1'
+
+# Serves the saved search page for /maps/search/... and the saved place page for /maps/place/...
+class FixtureHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.startswith('/maps/search/'):
+            name = 'http_search.html'
+        elif self.path.startswith('/maps/place/'):
+            name = 'http_place.html'
+        else:
+            self.send_error(404)
+            return
+        with open(os.path.join(FIXTURES, name), 'rb') as f:
+            body = f.read()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def base_url():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+def test_http_search_decodes_the_saved_search_page(base_url):
+    session = http_engine.make_session()
+    search_url = http_engine.maps_search_url('restaurants in Karachi', 24.86, 67.0, city='Karachi', base_url=base_url)
+    records = http_engine.http_search(session, search_url, base_url=base_url)
+    assert [record['name'] for record in records] == ['Kolachi Restaurant', 'Cafe Flo']
+    kolachi, flo = records
+    assert kolachi == {
+        'name': 'Kolachi Restaurant',
+        'website': 'https://kolachi.com.pk/',  # Unwrapped from Google's /url?q= redirect
+        'address': 'Abdul Sattar Edhi Ave, D.H.A. Phase 8, Karachi, Karachi City, Sindh 75500, Pakistan',
+        'lat': 24.7926,
+        'lng': 67.0512,
+        'rating': 4.5,
+        'reviews': 21874,
+        'phone': '021 35347981',
+        'category': 'Barbecue restaurant',
+        'url': http_engine.maps_place_url(KOLACHI_ID, base_url),
+    }
+    assert flo['website'] == 'No website available'
+    assert flo['phone'] is None
+    assert http_engine.feature_id_from_url(flo['url']) == '0x3eb33c8a2f5b1c9d:0x7d2e3f1a4b5c6d7e'
+
+def test_http_search_stops_at_max_results(base_url):
+    search_url = http_engine.maps_search_url('restaurants in Karachi', 24.86, 67.0, base_url=base_url)
+    assert len(http_engine.http_search(http_engine.make_session(), search_url, max_results=1, base_url=base_url)) == 1
+
+def test_http_place_decodes_the_saved_place_page(base_url):
+    place_url = http_engine.maps_place_url(KOLACHI_ID, base_url)
+    record = http_engine.http_place(http_engine.make_session(), place_url, base_url=base_url)
+    assert record['name'] == 'Kolachi Restaurant'
+    assert (record['lat'], record['lng']) == (24.7926, 67.0512)
+    assert record['url'] == place_url
+
+# A page without embedded data (e.g. a consent wall) has no state to decode
+def test_extract_app_state_without_state():
+    assert http_engine.extract_app_state('<html><body>Before you continue</body></html>') is None
@@ -0,0 +1,24 @@
+import ast
+import os
+import subprocess
+import sys
+
+import gmapscraper
+
+PACKAGE_INIT = os.path.join(os.path.dirname(gmapscraper.__file__), '__init__.py')
+
+# Every public name is imported once in __init__ (a second import would silently shadow the first)
+def test_public_names_are_imported_once():
+    with open(PACKAGE_INIT, encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    names = [alias.asname or alias.name for node in tree.body if isinstance(node, ast.ImportFrom) for alias in node.names]
+    assert len(names) == len(set(names))
+    assert all(hasattr(gmapscraper, name) for name in names)
+
+# Importing the package starts no browser and pulls in none of the heavy optional dependencies
+def test_import_is_cheap():
+    heavy = ('selenium', 'bs4', 'requests', 'pandas', 'pyarrow', 'zstandard')
+    code = f"import sys, gmapscraper; print(','.join(m for m in {heavy!r} if m in sys.modules))"
+    loaded = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.dirname(PACKAGE_INIT))).stdout.strip()
+    assert loaded == ''
@@ -0,0 +1,62 @@
+import pytest
+
+pd = pytest.importorskip('pandas')
+
+from gmapscraper import postprocess
+
+# Function to clean addresses and return the (address, city, postcode, country) rows
+def cleaned_addresses(*addresses):
+    df = postprocess.clean_results([{'name': 'x', 'website': 'No website available', 'address': address} for address in addresses])
+    return [tuple(None if pd.isna(value) else value for value in row)
+            for row in df[['address', 'city', 'postcode', 'country']].itertuples(index=False)]
+
+def test_city_is_the_name_in_the_postcode_segment_unless_it_is_a_region():
+    assert cleaned_addresses(
+        '4 Jinnah Avenue, Islamabad 44220, Pakistan',
+        'Abdul Sattar Edhi Ave, D.H.A. Phase 8, Karachi, Sindh 75500, Pakistan',
+        'Plot 2, New Delhi, Delhi 110037, India',
+        '101 Congress Ave, Austin, TX 78701, USA',
+        '968 Main Boulevard, London SW1A 1AA, United Kingdom',
+    ) == [
+        ('4 Jinnah Avenue, Islamabad 44220, Pakistan', 'Islamabad', '44220', 'Pakistan'),
+        ('Abdul Sattar Edhi Ave, D.H.A. Phase 8, Karachi, Sindh 75500, Pakistan', 'Karachi', '75500', 'Pakistan'),
+        ('Plot 2, New Delhi, Delhi 110037, India', 'New Delhi', '110037', 'India'),
+        ('101 Congress Ave, Austin, TX 78701, United States', 'Austin', '78701', 'United States'),
+        ('968 Main Boulevard, London SW1A 1AA, United Kingdom', 'London', 'SW1A 1AA', 'United Kingdom'),
+    ]
+
+def test_repeated_segments_and_native_country_names_are_cleaned():
+    assert cleaned_addresses(
+        '4 Jinnah Avenue, Islamabad 44220 4 Jinnah Avenue, Islamabad 44220, پاکستان',
+        'Shop 3, Lahore, Lahore, Punjab 54000, باكستان',
+        'Eidgah Ground,, Shahid Road,Lahore,Pakistan',
+    ) == [
+        ('4 Jinnah Avenue, Islamabad 44220, Pakistan', 'Islamabad', '44220', 'Pakistan'),
+        ('Shop 3, Lahore, Punjab 54000, Pakistan', 'Lahore', '54000', 'Pakistan'),
+        ('Eidgah Ground, Shahid Road, Lahore, Pakistan', None, None, 'Pakistan'),
+    ]
+
+# A run with no real address (no results, or only N/A) must not fail the clean step
+def test_no_addresses():
+    assert len(postprocess.clean_results([])) == 0
+    assert cleaned_addresses('N/A') == [(None, None, None, None)]
+
+def test_clean_csv_with_only_missing_addresses(tmp_path):
+    source = tmp_path / 'results.csv'
+    source.write_text('name,website,address\nX,No website available,N/A\n', encoding='utf-8')
+    assert postprocess.clean_csv(str(source), str(tmp_path / 'clean.csv')) == 1
+
+def test_websites_are_canonicalized():
+    df = postprocess.clean_results([
+        {'website': 'https://www.Example.com/?utm_source=gmb&id=2'},
+        {'website': 'https://bit.ly/abc'},
+        {'website': 'https://www.google.com/url?q=https://a.com'},
+        {'website': 'https://shop.pk/?utm_source=gmb&utm_medium=org&utm_campaign=x'},
+        {'website': 'https://shop.pk/menu?a=1&fbclid=z&gclid=q'},
+        {'website': 'https://shop.pk/menu?utm_source=gmb&a=1&gclid=q#top'},
+    ])
+    assert df['website'].tolist() == ['https://www.Example.com/?id=2', 'https://bit.ly/abc', 'https://www.google.com/url?q=https://a.com',
+                                      'https://shop.pk/', 'https://shop.pk/menu?a=1', 'https://shop.pk/menu?a=1#top']
+    assert df['website_domain'].tolist() == ['example.com', 'bit.ly', 'google.com', 'shop.pk', 'shop.pk', 'shop.pk']
+    assert df['website_shortener'].tolist() == [False, True, False, False, False, False]
+    assert df['website_redirect'].tolist() == [False, False, True, False, False, False]
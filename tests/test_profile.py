@@ -0,0 +1,35 @@
+import multiprocessing
+import os
+import time
+
+from gmapscraper import profile
+
+# Function run in each competing process: try the lock, report, then hold it until the parent is done
+def take_lock(profile_dir, results, done):
+    results.put(profile.try_lock(profile_dir))
+    done.wait(10)
+
+def test_only_one_of_many_simultaneous_sessions_gets_the_lock(tmp_path):
+    results = multiprocessing.Queue()
+    done = multiprocessing.Event()
+    workers = [multiprocessing.Process(target=take_lock, args=(str(tmp_path), results, done)) for _ in range(8)]
+    for worker in workers:
+        worker.start()
+    taken = [results.get(timeout=10) for _ in workers]
+    done.set()
+    for worker in workers:
+        worker.join()
+    assert taken.count(True) == 1
+    assert [name for name in os.listdir(tmp_path) if name != profile.LOCK_NAME] == []  # No temporary files left
+
+def test_fresh_empty_lock_counts_as_held(tmp_path):
+    (tmp_path / profile.LOCK_NAME).write_text('')
+    assert profile.try_lock(str(tmp_path)) is False
+
+def test_stale_locks_are_taken_over(tmp_path):
+    lock_path = tmp_path / profile.LOCK_NAME
+    lock_path.write_text('')
+    old = time.time() - profile.EMPTY_LOCK_GRACE - 1
+    os.utime(lock_path, (old, old))
+    assert profile.try_lock(str(tmp_path)) is True
+    assert lock_path.read_text() == str(os.getpid())
@@ -0,0 +1,70 @@
+import csv
+import io
+import pickle
+
+import pytest
+
+from gmapscraper.record import PlaceRecord, compact
+
+KOLACHI = {
+    'name': 'Kolachi Restaurant', 'website': 'https://kolachi.com.pk/', 'address': 'Abdul Sattar Edhi Ave, D.H.A. Phase 8, Karachi, Sindh 75500, Pakistan',
+    'phone': '02135347981', 'rating': 4.5, 'reviews': 21874, 'category': 'Barbecue restaurant', 'lat': 24.7926, 'lng': 67.0512,
+    'place_id': '0x3eb33e1e6c1fe8a3:0x2a1a0b2c58f0e0c1', 'scraped_at': '2026-10-01T08:00:00Z', 'url': 'https://www.google.com/maps/place/x',
+}
+
+@pytest.mark.parametrize('address', [
+    'Pakistan',
+    'Sindh 75500, Pakistan',
+    'Karachi, Sindh 75500, Pakistan',
+    'Abdul Sattar Edhi Ave, D.H.A. Phase 8, Karachi, Sindh 75500, Pakistan',
+    'N/A',
+    '',
+    None,
+])
+def test_addresses_round_trip(address):
+    record = PlaceRecord(address=address)
+    assert record['address'] == address
+    assert dict(record) == {'address': address}
+
+def test_address_tail_is_shared_between_places():
+    first = PlaceRecord(address='Shop 3, Clifton, Sindh 75500, Pakistan')
+    second = PlaceRecord(address=''.join(['Block 2, Sindh 75500', ', Pakistan']))  # Built at run time, not a shared constant
+    assert first._address_tail is second._address_tail
+    assert (first['address'], second['address']) == ('Shop 3, Clifton, Sindh 75500, Pakistan', 'Block 2, Sindh 75500, Pakistan')
+
+def test_replacing_or_deleting_the_address_drops_its_tail():
+    record = PlaceRecord(address='Karachi, Sindh 75500, Pakistan')
+    record['address'] = 'Pakistan'
+    assert record['address'] == 'Pakistan'
+    del record['address']
+    assert 'address' not in record and record._address_tail is None
+    record['address'] = 'Lahore'
+    assert record['address'] == 'Lahore'
+
+def test_delitem():
+    record = PlaceRecord(KOLACHI, query='restaurants')
+    del record['phone']
+    del record['query']
+    assert 'phone' not in record and 'query' not in record
+    assert len(record) == len(KOLACHI) - 1
+    for key in ('phone', 'query', 'unknown'):
+        with pytest.raises(KeyError):
+            del record[key]
+
+def test_dict_and_csv_see_the_same_fields_as_the_plain_record():
+    record = PlaceRecord(KOLACHI, query='restaurants')
+    assert dict(record) == dict(KOLACHI, query='restaurants')
+    assert list(record)[-1] == 'query'  # Extra fields come after the record fields
+    assert record.get('missing') is None and compact(record) is record
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=list(KOLACHI), extrasaction='ignore')  # As output.save_to_csv
+    writer.writerow(record)
+    assert 'Abdul Sattar Edhi Ave, D.H.A. Phase 8, Karachi, Sindh 75500, Pakistan' in out.getvalue()
+
+def test_pickle_round_trip():
+    record = PlaceRecord(KOLACHI, query='restaurants')
+    del record['website']
+    restored = pickle.loads(pickle.dumps(record))
+    assert isinstance(restored, PlaceRecord)
+    assert dict(restored) == dict(record)
+    assert restored['address'] == KOLACHI['address'] and restored._address_tail == 'Sindh 75500, Pakistan'
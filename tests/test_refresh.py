@@ -0,0 +1,36 @@
+from gmapscraper import refresh
+
+KOLACHI_URL = 'https://www.google.com/maps/place/Kolachi/data=!4m7!3m6!1s0x3eb33e1e6c1fe8a3:0x2a1a0b2c58f0e0c1!8m2!3d24.79!4d67.05'
+
+def place(place_id, name, rating=4.5):
+    return {'place_id': place_id, 'name': name, 'rating': rating, 'scraped_at': '2026-10-01T08:00:00Z'}
+
+PREVIOUS = {'0x1:0x1': place('0x1:0x1', 'Cafe Flo'), '0x2:0x2': place('0x2:0x2', 'Kolachi'), '0x3:0x3': place('0x3:0x3', 'Xander')}
+
+def changed(changes, change):
+    return sorted(row['place_id'] for row in changes if row['change'] == change)
+
+def test_complete_search_reports_missing_places_as_removed():
+    results, changes = refresh.diff_results(PREVIOUS, [place('0x1:0x1', 'Cafe Flo', 4.6), place('0x4:0x4', 'Okra')], [])
+    assert changed(changes, refresh.CHANGE_ADDED) == ['0x4:0x4']
+    assert changed(changes, refresh.CHANGE_MODIFIED) == ['0x1:0x1']
+    assert changed(changes, refresh.CHANGE_REMOVED) == ['0x2:0x2', '0x3:0x3']
+    assert len(results) == 2
+
+def test_incomplete_search_keeps_unseen_places_and_removes_nothing():
+    results, changes = refresh.diff_results(PREVIOUS, [place('0x4:0x4', 'Okra')], [], complete=False)
+    assert changed(changes, refresh.CHANGE_ADDED) == ['0x4:0x4']
+    assert changed(changes, refresh.CHANGE_REMOVED) == []
+    assert sorted(record['place_id'] for record in results) == ['0x1:0x1', '0x2:0x2', '0x3:0x3', '0x4:0x4']
+
+def test_blocked_search_carries_the_previous_run_forward():
+    failures = [{'url': 'https://www.google.com/maps/search/cafe', 'error_type': 'interstitial', 'attempts': 1, 'error': 'Search page: captcha'}]
+    results, changes = refresh.diff_results(PREVIOUS, [], failures, complete=False)
+    assert changes == []
+    assert results == list(PREVIOUS.values())
+
+def test_failed_places_are_not_removed():
+    previous = dict(PREVIOUS, **{'0x3eb33e1e6c1fe8a3:0x2a1a0b2c58f0e0c1': place('0x3eb33e1e6c1fe8a3:0x2a1a0b2c58f0e0c1', 'Kolachi')})
+    results, changes = refresh.diff_results(previous, list(PREVIOUS.values()), [{'url': KOLACHI_URL}])
+    assert changes == []
+    assert len(results) == 4
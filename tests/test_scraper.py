@@ -0,0 +1,114 @@
+import os
+
+from gmapscraper import http_engine, pages, scraper
+from gmapscraper.pages import SearchOutcome
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+KOLACHI_ID = '0x3eb33e1e6c1fe8a3:0x2a1a0b2c58f0e0c1'
+FLO_ID = '0x3eb33c8a2f5b1c9d:0x7d2e3f1a4b5c6d7e'
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as f:
+        return f.read()
+
+# Stands in for a Firefox driver on the saved search page: the feed lists both places and no XHR arrives
+class SearchPageDriver:
+    def __init__(self, html):
+        self.state = http_engine.extract_app_state(html)
+        self.links = [http_engine.maps_place_url(feature_id) for feature_id in (KOLACHI_ID, FLO_ID)]
+        self.current_url = None
+
+    def get(self, url):
+        self.current_url = url
+
+    def find_elements(self, by, selector):
+        return [object()] * (len(self.links) if 'hfpxzc' in selector else 1)
+
+    def find_element(self, by, selector):
+        return object()
+
+    def execute_script(self, script, *args):
+        if 'APP_INITIALIZATION_STATE' in script:
+            return self.state
+        if script == scraper.XHR_DRAIN_SCRIPT:
+            return []
+        if 'scrollHeight' in script:
+            return 1000
+        return None
+
+    @property
+    def page_source(self):
+        return ''.join(f'<a class="hfpxzc" href="{link}"></a>' for link in self.links)
+
+def test_payload_places_are_collected_from_the_embedded_state():
+    captured = {}
+    scraper.collect_payload_places(captured, http_engine.iter_payloads(http_engine.extract_app_state(read_fixture('http_search.html'))))
+    assert sorted(captured) == sorted([KOLACHI_ID, FLO_ID])
+    assert captured[KOLACHI_ID]['name'] == 'Kolachi Restaurant'
+
+def test_capture_decodes_the_embedded_first_page_without_visits(monkeypatch):
+    monkeypatch.setattr(scraper, 'classify_search_page', lambda driver, timeout=30: SearchOutcome.RESULTS)
+    driver = SearchPageDriver(read_fixture('http_search.html'))
+    records, place_urls, failures, outcome, complete = scraper.harvest_search(driver, 'restaurants in Karachi', 24.86, 67.0, sleep_time=0, capture_xhr=True)
+    assert [record['name'] for record in records] == ['Kolachi Restaurant', 'Cafe Flo']
+    assert place_urls == [] and failures == []
+    assert outcome == SearchOutcome.RESULTS and complete
+
+# Stands in for a driver with tabs: right after a navigation a tab can't be polled for a few rounds (it is
+# still unloading), the first visit of consent_url lands on the consent page, and every place renders place.html
+class TabsDriver:
+    def __init__(self, unloading_polls=3, consent_url=None):
+        self.unloading_polls = unloading_polls
+        self.consent_url = consent_url
+        self.handles = ['tab-0']
+        self.current_window_handle = 'tab-0'
+        self.tabs = {}  # handle -> [url, polls left before the tab answers]
+        self.consent_accepted = 0
+        self.switch_to = self
+
+    def new_window(self, kind):
+        self.current_window_handle = f"tab-{len(self.handles)}"
+        self.handles.append(self.current_window_handle)
+
+    def window(self, handle):
+        self.current_window_handle = handle
+
+    def close(self):
+        pass
+
+    def execute_script(self, script, *args):
+        tab = self.tabs.get(self.current_window_handle)
+        if script == scraper.TAB_NAVIGATE_SCRIPT:
+            url = args[0]
+            if url == self.consent_url and not self.consent_accepted:
+                url = 'https://consent.google.com/ml?continue=' + url
+            self.tabs[self.current_window_handle] = [url, self.unloading_polls]
+        elif script == scraper.TAB_STATE_SCRIPT:
+            if tab[1] > 0:
+                tab[1] -= 1
+                raise RuntimeError("JavaScript error: document unloaded while waiting for result")
+            return [False, 'complete', tab[0], 'consent.google.' not in tab[0]]
+        elif script == pages.ACCEPT_CONSENT_SCRIPT:
+            self.consent_accepted += 1
+            return True
+        return None
+
+    @property
+    def page_source(self):
+        return read_fixture('place.html')
+
+def test_multitab_waits_for_unloading_tabs_without_spending_retries():
+    urls = [http_engine.maps_place_url(f"0x{number}:0x{number}") for number in range(1, 4)]
+    failures = []
+    records = list(scraper.iter_places_multitab(TabsDriver(), urls, failures, tabs=2, max_attempts=1, poll_interval=0))
+    assert failures == []
+    assert sorted(record['url'] for record in records) == sorted(urls)
+
+def test_multitab_accepts_consent_before_retrying():
+    url = http_engine.maps_place_url('0x1:0x1')
+    driver = TabsDriver(unloading_polls=0, consent_url=url)
+    failures = []
+    records = list(scraper.iter_places_multitab(driver, [url], failures, tabs=2, max_attempts=2, backoff=0, poll_interval=0))
+    assert driver.consent_accepted == 1
+    assert failures == []
+    assert [record['name'] for record in records] == ['Kolachi Restaurant']
@@ -0,0 +1,71 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from gmapscraper import service, session
+
+# Stands in for session.Scraper: yields places until its deadline stops, or hangs (like a stuck page load)
+# until its browser is closed
+class FakeScraper:
+    closed = 0
+    archives = []
+
+    def __init__(self, hang=False, **options):
+        FakeScraper.archives.append(options.get('archive'))
+        self.hang = hang
+        self.sleep_time = 1
+        self.last_failures = []
+        self.last_outcome = None
+        self.browser_gone = threading.Event()
+
+    def iter_results(self, query, deadline=None, **options):
+        for number in range(1000):
+            if self.hang:
+                self.browser_gone.wait(10)
+                raise RuntimeError("browser closed")
+            if deadline.expired():
+                return
+            yield {'name': f"Place {number}"}
+            time.sleep(0.02)
+
+    def close(self):
+        FakeScraper.closed += 1
+        self.browser_gone.set()
+
+# Function to start a one-worker service over FakeScrapers and submit a long job to it
+def start_job(monkeypatch, hang):
+    FakeScraper.closed = 0
+    monkeypatch.setattr(session, 'Scraper', lambda **options: FakeScraper(hang=hang, **options))
+    scrape_service = service.ScrapeService(workers=1, warm=False)
+    scrape_service.start()
+    job = scrape_service.submit('team-a', {'term': 'cafe', 'country': 'Pakistan', 'num': 1000})
+    time.sleep(0.3)
+    return scrape_service, job
+
+def test_close_stops_running_jobs_and_keeps_their_results(monkeypatch):
+    scrape_service, job = start_job(monkeypatch, hang=False)
+    scrape_service.close(timeout=5)
+    assert job.status == service.JOB_CANCELLED
+    assert 0 < len(job.results) < 1000
+    assert FakeScraper.closed >= 1
+    assert not any(thread.is_alive() for thread in scrape_service.pool.threads)
+
+def test_close_quits_the_browser_of_a_stuck_job(monkeypatch):
+    scrape_service, job = start_job(monkeypatch, hang=True)
+    scrape_service.close(timeout=0.5)
+    assert job.status == service.JOB_CANCELLED
+    assert FakeScraper.closed >= 1
+    assert not any(thread.is_alive() for thread in scrape_service.pool.threads)
+
+def test_workers_share_one_archive_closed_on_shutdown(monkeypatch, tmp_path):
+    FakeScraper.archives = []
+    monkeypatch.setattr(session, 'Scraper', lambda **options: FakeScraper(**options))
+    scrape_service = service.ScrapeService(workers=3, warm=False, archive=str(tmp_path / 'pages.sqlite'))
+    scrape_service.start()
+    scrape_service.close(timeout=5)
+    assert len(FakeScraper.archives) == 3
+    assert all(archive is scrape_service.archive for archive in FakeScraper.archives)
+    with pytest.raises(sqlite3.ProgrammingError):  # Closed along with the service
+        scrape_service.archive.db.execute("SELECT 1")